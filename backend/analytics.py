@@ -0,0 +1,137 @@
+# backend/analytics.py
+from __future__ import annotations
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .attendanceData import AttendanceData
+from .student import Student
+
+# Column order of the attendance count matrix; "other" codes are summed into the last column
+COUNT_FIELDS: List[str] = [f.name for f in fields(AttendanceData) if f.name != "other"]
+_COLUMN = {name: i for i, name in enumerate(COUNT_FIELDS)}
+_OTHER = len(COUNT_FIELDS)
+
+# Mirrors AttendanceData.total_absences / percent_tardy
+ABSENCE_FIELDS = [
+    "absent", "excused_absence", "excused_absence_transport", "excused_absence_medical",
+    "out_of_school_suspension", "quarantine_absent", "quarantine_excused_absence",
+]
+ATTENDED_FIELDS = ["present", "tardy", "pfd", "quarantine_present"]
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+@dataclass
+class ClassSummary:
+    """Class-level aggregates for the counselor cover sheet."""
+    student_count: int = 0
+    grade_distribution: Dict[str, int] = field(default_factory=dict)
+    grade_mean: Optional[float] = None
+    grade_percentiles: Dict[str, float] = field(default_factory=dict)
+    attendance_count: int = 0
+    chronic_absence_threshold: float = 10.0
+    chronically_absent: List[Dict[str, float]] = field(default_factory=list)
+    absence_rate_mean: Optional[float] = None
+    tardy_rate_mean: Optional[float] = None
+    tardy_rate_percentiles: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "student_count": self.student_count,
+            "grade_distribution": dict(self.grade_distribution),
+            "grade_mean": self.grade_mean,
+            "grade_percentiles": dict(self.grade_percentiles),
+            "attendance_count": self.attendance_count,
+            "chronic_absence_threshold": self.chronic_absence_threshold,
+            "chronically_absent": [dict(s) for s in self.chronically_absent],
+            "absence_rate_mean": self.absence_rate_mean,
+            "tardy_rate_mean": self.tardy_rate_mean,
+            "tardy_rate_percentiles": dict(self.tardy_rate_percentiles),
+        }
+
+
+def attendance_matrix(records: Sequence[AttendanceData]) -> np.ndarray:
+    """(students x codes) int matrix, one pass over the records."""
+    matrix = np.zeros((len(records), len(COUNT_FIELDS) + 1), dtype=np.int64)
+    for row, record in enumerate(records):
+        values = vars(record)
+        matrix[row, :_OTHER] = [values[name] for name in COUNT_FIELDS]
+        matrix[row, _OTHER] = sum(record.other.values())
+    return matrix
+
+
+def grade_percents(students: Sequence[Student]) -> np.ndarray:
+    """Numeric grade percentages; unparseable cells become NaN."""
+    out = np.full(len(students), np.nan)
+    for i, student in enumerate(students):
+        try:
+            out[i] = student.getGrade()
+        except (ValueError, AttributeError):
+            pass
+    return out
+
+
+def _rate(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(100.0 * numerator, denominator,
+                     out=np.zeros(len(numerator)), where=denominator > 0)
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {}
+    return {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def _mean(values: np.ndarray) -> Optional[float]:
+    values = values[~np.isnan(values)]
+    return round(float(values.mean()), 2) if values.size else None
+
+
+def summarize_class(
+    students: Sequence[Student],
+    attendance_data: Optional[Dict[str, AttendanceData]] = None,
+    chronic_absence_threshold: float = 10.0,
+) -> ClassSummary:
+    """Grade distribution, chronic absence and tardy rates across ``students``."""
+    summary = ClassSummary(student_count=len(students), chronic_absence_threshold=chronic_absence_threshold)
+    if not students:
+        return summary
+
+    percents = grade_percents(students)
+    letters, counts = np.unique(np.array([s.grade for s in students]), return_counts=True)
+    summary.grade_distribution = {str(g): int(c) for g, c in zip(letters, counts)}
+    summary.grade_mean = _mean(percents)
+    summary.grade_percentiles = _percentiles(percents)
+
+    attendance_data = attendance_data or {}
+    matched = [s for s in students if s.name in attendance_data]
+    summary.attendance_count = len(matched)
+    if not matched:
+        return summary
+
+    matrix = attendance_matrix([attendance_data[s.name] for s in matched])
+    total_days = matrix.sum(axis=1)
+    absences = matrix[:, [_COLUMN[f] for f in ABSENCE_FIELDS]].sum(axis=1)
+    attended = matrix[:, [_COLUMN[f] for f in ATTENDED_FIELDS]].sum(axis=1)
+    percent_absent = _rate(absences, total_days)
+    percent_tardy = _rate(matrix[:, _COLUMN["tardy"]], attended)
+
+    summary.absence_rate_mean = _mean(percent_absent)
+    summary.tardy_rate_mean = _mean(percent_tardy)
+    summary.tardy_rate_percentiles = _percentiles(percent_tardy)
+
+    chronic = np.flatnonzero(percent_absent >= chronic_absence_threshold)
+    chronic = chronic[np.argsort(-percent_absent[chronic], kind="stable")]
+    summary.chronically_absent = [
+        {
+            "name": matched[i].display_name,
+            "percent_absent": round(float(percent_absent[i]), 1),
+            "absences": int(absences[i]),
+            "days": int(total_days[i]),
+        }
+        for i in chronic
+    ]
+    return summary
@@ -1,6 +1,6 @@
 import re
 from typing import Dict, List, Tuple
-import PyPDF2
+from .metrics import current_metrics
 from .util import normalize_name
 
 # Try to import AttendanceData, handle both relative and direct imports
@@ -164,20 +164,26 @@ def parse_attendance_data(pdf_path: str) -> Dict[str, AttendanceData]:
     """Parse attendance data from PDF file."""
     if pdf_path == "":
         return {}
-        
+
+    import PyPDF2  # deferred: only needed when an attendance report is supplied
+
+    metrics = current_metrics()
     try:
-        with open(pdf_path, 'rb') as f:
+        with metrics.stage("pdf_extract"), open(pdf_path, 'rb') as f:
             reader = PyPDF2.PdfReader(f)
             full_text = ""
             
             for p in reader.pages:
                 t = p.extract_text()
+                metrics.count("pages_extracted")
                 if t:
                     full_text += t + "\n"
                     
     except Exception as e:
         raise RuntimeError(f"Error reading PDF '{pdf_path}': {e}")
 
-    data_map = parse_text_to_map(full_text)
+    with metrics.stage("parse_attendance"):
+        data_map = parse_text_to_map(full_text)
+    metrics.count("attendance_records", len(data_map))
     
     return data_map
\ No newline at end of file
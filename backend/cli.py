@@ -1,6 +1,6 @@
 from __future__ import annotations
 import argparse, json, sys, os
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 app_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if app_root not in sys.path:
@@ -11,16 +11,21 @@ try:
 except ImportError:
     from backend.settings import Settings
 
+# Subcommands import their own dependencies so that e.g. list-students never
+# loads python-docx, lxml, PyPDF2 or requests.
 try:
-    from backend.report_generator import (
-        generate_report_for_selected,
-        parse_students,
-    )
+    from backend.scoresheet import parse_students
 except ImportError:
-    from report_generator import (
-        generate_report_for_selected,
-        parse_students,
-    )
+    from scoresheet import parse_students
+
+try:
+    from backend.metrics import Metrics, set_metrics
+    from backend.output import COMPRESSION_LEVELS
+    from backend.progress import ProgressReporter
+except ImportError:
+    from metrics import Metrics, set_metrics
+    from output import COMPRESSION_LEVELS
+    from progress import ProgressReporter
 
 def emit(kind: str, **payload):
     print(json.dumps({"type": kind, **payload}), flush=True)
@@ -33,7 +38,26 @@ def list_students_cmd(input_path: str, settings: Settings):
     ]
     emit("students", items=items)
 
-def generate_selected_cmd(scoresheet_path: str, selection_json: str, settings: Settings, output_path: str, attendance_path = ""):
+def class_summary_cmd(input_path: str, settings: Settings, attendance_path: str = "", chronic_threshold: float = 10.0):
+    try:
+        from backend.analytics import summarize_class
+        from backend.attendance import parse_attendance_data
+    except ImportError:
+        from analytics import summarize_class
+        from attendance import parse_attendance_data
+
+    students = parse_students(input_path, settings)
+    summary = summarize_class(students, parse_attendance_data(attendance_path), chronic_threshold)
+    emit("summary", **summary.to_dict())
+
+def generate_selected_cmd(scoresheet_path: str, selection_json: str, settings: Settings, output_dir: str, attendance_path = "", open_output: bool = True, progress_interval: float = 0.1, progress_step: int = 1, include_summary: bool = False, chronic_threshold: float = 10.0, output_format: str = "docx", compression: Optional[str] = None):
+    if include_summary and output_format == "pdf":
+        emit("error", error="--summary is only supported with --format docx")
+        return 1
+    if compression is not None and output_format == "pdf":
+        emit("error", error="--compression is only supported with --format docx")
+        return 1
+
     try:
         with open(selection_json, "r", encoding="utf-8") as f:
             sel = json.load(f)
@@ -44,48 +68,109 @@ def generate_selected_cmd(scoresheet_path: str, selection_json: str, settings: S
     selected_map: Dict[str, bool] = sel.get("selected", {})
     lang_map: Dict[str, str] = sel.get("languages", {})
 
+    try:
+        from backend.report_generator import generate_report_for_selected
+    except ImportError:
+        from report_generator import generate_report_for_selected
+
     students = parse_students(scoresheet_path, settings)
     pairs: List[Tuple] = []
     for s in students:
         if selected_map.get(s.name, False):
             pairs.append((s, lang_map.get(s.name, settings.default_language)))
 
-    def progress_cb(pct: int):
-        emit("progress", value=int(pct))
+    progress_cb = ProgressReporter(
+        lambda pct: emit("progress", value=pct),
+        min_interval=progress_interval,
+        min_step=progress_step,
+    )
 
-    output_path = generate_report_for_selected(
+    result = generate_report_for_selected(
         settings=settings,
         student_language_pairs=pairs,
-        output_dir=None,
+        output_dir=output_dir or None,
         on_progress=progress_cb,
-        attendance_path=attendance_path
+        attendance_path=attendance_path,
+        include_summary=include_summary,
+        chronic_absence_threshold=chronic_threshold,
+        output_format=output_format,
+        compression=compression,
     )
-    emit("done", output=output_path)
+    progress_cb.flush()
+    if open_output:
+        import webbrowser
+        webbrowser.open(result.path)
+    emit("done", output=result.path, bytes_written=result.bytes_written, save_seconds=round(result.seconds, 3))
     return 0
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--settings", type=str, help="Path to settings JSON (defaults to user.settings)")
+    parser.add_argument("--metrics", action="store_true", help="Emit per-stage 'timing' events and a final 'metrics' event")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
-    ls = sub.add_parser("list-students")
+    profiling = argparse.ArgumentParser(add_help=False)
+    profiling.add_argument("--profile", metavar="DIR", default="", help="Write a cProfile dump and tracemalloc summary to DIR")
+    profiling.add_argument("--profile-top", type=int, default=15, help="Entries per section of the profile summary")
+
+    ls = sub.add_parser("list-students", parents=[profiling])
     ls.add_argument("--input", required=True)
 
-    gen_sel = sub.add_parser("generate-selected")
+    summ = sub.add_parser("class-summary", parents=[profiling])
+    summ.add_argument("--input", required=True)
+    summ.add_argument("--attendance", default="")
+    summ.add_argument("--chronic-threshold", type=float, default=10.0, help="Percent of days absent that counts as chronic")
+
+    gen_sel = sub.add_parser("generate-selected", parents=[profiling])
     gen_sel.add_argument("--input", required=True)
     gen_sel.add_argument("--selection", required=True)
-    gen_sel.add_argument("--output-dir", default="")
+    gen_sel.add_argument("--output-dir", default="", help="Directory for the .docx (defaults to ~/Downloads)")
     gen_sel.add_argument("--attendance", default="")
+    gen_sel.add_argument("--no-open", dest="open_output", action="store_false", help="Do not open the report after saving")
+    gen_sel.add_argument("--progress-interval", type=float, default=0.1, help="Minimum seconds between progress events")
+    gen_sel.add_argument("--progress-step", type=int, default=1, help="Minimum percentage points between progress events")
+    gen_sel.add_argument("--summary", action="store_true", help="Start the report with a class summary cover sheet (docx only)")
+    gen_sel.add_argument("--format", dest="output_format", choices=["docx", "pdf"], default="docx",
+                         help="pdf writes print-ready letters directly, without Word")
+    gen_sel.add_argument("--compression", choices=COMPRESSION_LEVELS,
+                         help="docx zip compression: stored, fast, default (the default), best or a 0-9 deflate level")
+    gen_sel.add_argument("--chronic-threshold", type=float, default=10.0, help="Percent of days absent that counts as chronic")
 
     args = parser.parse_args()
+    sink = emit if args.metrics else None
+    if args.profile:
+        # Imported here so cProfile/tracemalloc cost nothing on normal runs
+        try:
+            from backend.profiling import ProfilingMetrics
+        except ImportError:
+            from profiling import ProfilingMetrics
+        metrics = ProfilingMetrics(args.profile, label=args.cmd, top_n=args.profile_top, sink=sink)
+        metrics.start()
+    else:
+        metrics = Metrics(sink=sink) if args.metrics else None
+    set_metrics(metrics)
+    try:
+        sys.exit(run_command(args))
+    finally:
+        if args.profile:
+            emit("profile", **metrics.finish())
+        if args.metrics:
+            emit("metrics", **metrics.snapshot())
+
+def run_command(args) -> int:
     settings = Settings.load_from_file(filepath=args.settings) if args.settings else Settings.load_from_file()
 
     if args.cmd == "list-students":
         list_students_cmd(args.input, settings)
-        return
+        return 0
+    if args.cmd == "class-summary":
+        class_summary_cmd(args.input, settings, args.attendance, args.chronic_threshold)
+        return 0
     if args.cmd == "generate-selected":
-        sys.exit(generate_selected_cmd(args.input, args.selection, settings, args.output_dir, args.attendance))
-        return
+        return generate_selected_cmd(args.input, args.selection, settings, args.output_dir, args.attendance, args.open_output,
+                                     args.progress_interval, args.progress_step, args.summary, args.chronic_threshold,
+                                     args.output_format, args.compression)
+    return 0
 
 if __name__ == "__main__":
     try:
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Callable, Optional
 
 from .attendanceData import AttendanceData
@@ -8,18 +9,34 @@ from .student import Student
 ProgressFn = Optional[Callable[[int], None]]
 
 
+@dataclass(frozen=True)
+class LetterTemplates:
+    """The translated, student-independent parts of a letter for one language."""
+    language: str
+    custom_message: str
+    message: str
+    translated_message: str
+    missing_assignments_text: str
+    forms: str
+    should_translate: bool
+    with_attendance: bool
+
+
 class LetterWriter:
-    def __init__(self, name, email, language, custom_message, attendanceData: dict[str, AttendanceData], progress_cb: ProgressFn = None):
+    def __init__(self, name, email, language, custom_message, attendanceData: dict[str, AttendanceData], progress_cb: ProgressFn = None,
+                 with_attendance: Optional[bool] = None):
         self.teacher_name = sanitize_input(name)
         self.teacher_email = sanitize_input(email)
         self.language = sanitize_input(language)
         self.custom_message = sanitize_input(custom_message)
         self.should_translate = True
         self.attendance_data = attendanceData
+        # Templates can be built ahead of the attendance data (see build_snapshot)
+        self.with_attendance = len(attendanceData) > 0 if with_attendance is None else with_attendance
         self._progress = progress_cb or (lambda _p: None)
 
         self.message = "To the Parent/Guardian of {},\n"
-        if len(self.attendance_data) > 0:
+        if self.with_attendance:
             self.message += "\tThis letter is to let you know that {} currently has a grade of {} ({}) in their {} class and has {} missing assignments, {} tardies, and {} absences. "
         else:
             self.message += "\tThis letter is to let you know that {} currently has a grade of {} ({}) in their {} class and has {} missing assignments. "
@@ -47,7 +64,7 @@ class LetterWriter:
             self.translated_message += translate("in their", language).lower() + f" {ltr}{{}}{pdf} "
             self._progress(40)
             self.translated_message += translate("class and has", language) + f" {ltr}{{}}{pdf} "
-            if len(self.attendance_data) > 0:
+            if self.with_attendance:
                 self.translated_message += translate("missing assignments", language).lower() + f", {ltr}{{}}{pdf} "
                 self.translated_message += translate("tardies", language).lower() + ", "
                 self.translated_message += translate("and", language).lower() + f" {ltr}{{}}{pdf} "
@@ -77,6 +94,32 @@ class LetterWriter:
             self.forms += "Parent Signature: ______________________________\n\n"
             self.forms += "Date: _______________________________\n\n"
 
+    @property
+    def templates(self) -> LetterTemplates:
+        return LetterTemplates(self.language, self.custom_message, self.message, self.translated_message,
+                               self.missing_assignments_text, self.forms, self.should_translate,
+                               self.with_attendance)
+
+    @classmethod
+    def from_templates(cls, templates: LetterTemplates, name, email, attendanceData: dict[str, AttendanceData]):
+        """Writer over templates translated earlier; makes no translation requests."""
+        if templates.with_attendance != (len(attendanceData) > 0):
+            raise ValueError("letter templates were translated for a different attendance setting")
+        writer = cls.__new__(cls)
+        writer.teacher_name = sanitize_input(name)
+        writer.teacher_email = sanitize_input(email)
+        writer.language = templates.language
+        writer.custom_message = templates.custom_message
+        writer.should_translate = templates.should_translate
+        writer.attendance_data = attendanceData
+        writer.with_attendance = templates.with_attendance
+        writer._progress = lambda _p: None
+        writer.message = templates.message
+        writer.translated_message = templates.translated_message
+        writer.missing_assignments_text = templates.missing_assignments_text
+        writer.forms = templates.forms
+        return writer
+
     def generate_letter(self, student: Student):
         text = ""
         if len(self.attendance_data) > 0 and student.name in self.attendance_data:
@@ -135,6 +178,4 @@ class LetterWriter:
             text += "\n"
         text += self.forms
         text += f"{self.teacher_name}\n{student.subject} Teacher\n{self.teacher_email}"
-
-        self._progress(90)
         return text
\ No newline at end of file
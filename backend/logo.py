@@ -1,67 +1,111 @@
 import base64
+import binascii
+import hashlib
+import io
+import logging
 import os
 import re
-import sys 
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
 
-def create_logo_image(settings, logo_directory: str = None) -> str:
-    if not hasattr(settings, 'school_logo_dataurl') or not settings.school_logo_dataurl:
-        print("Error: 'school_logo_dataurl' not found in settings or is empty. Please ensure it's set correctly.")
-        return ""
+log = logging.getLogger(__name__)
+
+DATAURL_RE = re.compile(r"data:image/([\w.+-]+);base64,(.*)", re.DOTALL)
+
+# Normalise mime subtypes to the file extension the asset is stored under
+_EXTENSIONS = {"jpeg": "jpg", "svg+xml": "svg"}
+
+
+@dataclass(frozen=True)
+class LogoAsset:
+    """Decoded logo image, addressed by the sha256 of its bytes."""
+    digest: str
+    extension: str
+    data: bytes = field(repr=False)
 
-    data_url = settings.school_logo_dataurl
+    @property
+    def filename(self) -> str:
+        return f"logo-{self.digest[:16]}.{self.extension}"
 
-    match = re.match(r"data:image/(\w+);base64,(.*)", data_url)
+    def stream(self) -> io.BytesIO:
+        """Fresh in-memory stream python-docx can embed without touching disk."""
+        return io.BytesIO(self.data)
+
+
+def _make_asset(data: bytes, extension: str) -> LogoAsset:
+    return LogoAsset(hashlib.sha256(data).hexdigest(), extension, data)
+
+
+@lru_cache(maxsize=8)
+def decode_logo_dataurl(data_url: str) -> Optional[LogoAsset]:
+    """Decode a 'data:image/<ext>;base64,...' URL once per process."""
+    match = DATAURL_RE.match(data_url or "")
     if not match:
-        print("Error: Invalid data URL format. Expected 'data:image/<extension>;base64,...'")
-        return ""
+        log.warning("Invalid logo data URL; expected 'data:image/<extension>;base64,...'")
+        return None
+
+    subtype = match.group(1).lower()
+    try:
+        image_data = base64.b64decode(match.group(2))
+    except (binascii.Error, ValueError) as e:
+        log.warning("Could not decode logo data URL: %s", e)
+        return None
+    if not image_data:
+        log.warning("Decoded logo data is empty")
+        return None
+
+    return _make_asset(image_data, _EXTENSIONS.get(subtype, subtype))
 
-    file_extension = match.group(1).lower() 
-    if file_extension == 'jpeg':
-        file_extension = 'jpg'
-    
-    base64_string = match.group(2)
 
+@lru_cache(maxsize=8)
+def _read_logo_file(path: str, mtime_ns: int, size: int) -> Optional[LogoAsset]:
+    # mtime/size are part of the cache key so an edited file is re-read
     try:
-        image_data = base64.b64decode(base64_string)
-        if not image_data:
-            print("Error: Decoded image data is empty. The base64 string might be invalid.")
-            return ""
-    except base64.binascii.Error as e:
-        print(f"Error decoding base64 string: {e}. Ensure the base64 string is valid.")
-        return ""
-    except Exception as e:
-        print(f"An unexpected error occurred during base64 decoding: {e}")
-        return ""
+        with open(path, "rb") as f:
+            image_data = f.read()
+    except OSError as e:
+        log.warning("Could not read logo asset %s: %s", path, e)
+        return None
+    if not image_data:
+        return None
+    extension = os.path.splitext(path)[1].lstrip(".").lower() or "png"
+    return _make_asset(image_data, _EXTENSIONS.get(extension, extension))
 
-    if logo_directory:
-        output_base_dir = os.path.join(logo_directory, 'user_logos')
-    else:
 
-        if hasattr(sys, '_MEIPASS'):
-            script_dir = os.path.dirname(sys.executable)
+def load_logo(settings) -> Optional[LogoAsset]:
+    """Return the configured logo, preferring the stored asset over the data URL."""
+    asset_path = getattr(settings, "school_logo_asset", None)
+    if asset_path:
+        try:
+            st = os.stat(asset_path)
+        except OSError:
+            log.debug("Logo asset %s is missing; falling back to data URL", asset_path)
         else:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        output_base_dir = os.path.join(script_dir, '..', 'user_assets')
-        print(f"Warning: userDataPath not provided. Saving logo to local development path: {output_base_dir}")
+            asset = _read_logo_file(os.path.abspath(asset_path), st.st_mtime_ns, st.st_size)
+            if asset is not None:
+                return asset
 
-    try:
-        os.makedirs(output_base_dir, exist_ok=True)
-        print(f"Ensured output directory exists: {output_base_dir}")
-    except Exception as e:
-        print(f"Error creating output directory {output_base_dir}: {e}. Check permissions.")
-        return ""
+    data_url = getattr(settings, "school_logo_dataurl", None)
+    if not data_url:
+        log.debug("No school logo configured")
+        return None
+    return decode_logo_dataurl(data_url)
 
-    fixed_filename = f"logo.{file_extension}"
-    file_path = os.path.join(output_base_dir, fixed_filename)
+
+def store_logo(asset: LogoAsset, directory: str) -> str:
+    """Write the asset under its content-hashed name, skipping the write if it already exists."""
+    file_path = os.path.join(directory, asset.filename)
+    if os.path.exists(file_path):
+        return file_path
 
     try:
-        with open(file_path, 'wb') as f:
-            f.write(image_data)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(asset.data)
+        os.replace(tmp_path, file_path)
         return file_path
-    except IOError as e:
-        print(f"Error writing image file to {file_path}: {e}. Check directory permissions.")
+    except OSError as e:
+        log.warning("Could not write logo asset to %s: %s", file_path, e)
         return ""
-    except Exception as e:
-        print(f"An unexpected error occurred during file writing: {e}")
-        return ""
\ No newline at end of file
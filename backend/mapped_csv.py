@@ -0,0 +1,198 @@
+# backend/mapped_csv.py
+"""Memory-mapped scoresheet reader.
+
+The file is mapped read-only and row boundaries are found with ``find`` over
+the raw buffer. Each row comes back as a list of raw ``bytes`` cells (quoted
+cells keep their quotes); nothing is decoded to ``str`` until asked for, so
+building a Student only decodes the name and grade cells plus the headers of
+cells whose raw bytes are a zero score.
+"""
+from __future__ import annotations
+import mmap
+from itertools import compress
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .student import Student
+
+_BOM = b"\xef\xbb\xbf"
+_ZEROS = frozenset((b"0", b"0.0", b'"0"', b'"0.0"'))
+
+
+def decode_cell(cell: bytes) -> str:
+    if cell[:1] != b'"':
+        return cell.decode("utf-8")
+    body = cell[1:-1] if len(cell) > 1 and cell[-1:] == b'"' else cell[1:]
+    return body.decode("utf-8").replace('""', '"')
+
+
+class MappedCsv:
+    """Read-only view of a CSV file; see ``rows()``."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            self._buf = b""
+        except BaseException:
+            self._file.close()
+            raise
+        self._start = len(_BOM) if self._buf[:3] == _BOM else 0
+
+    def close(self):
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedCsv":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def has_bare_cr(self) -> bool:
+        """True if any CR is not followed by LF (e.g. Excel's "CSV (Macintosh)")."""
+        buf, find = self._buf, self._buf.find
+        cr = find(b"\r")
+        while cr != -1:
+            if buf[cr + 1:cr + 2] != b"\n":
+                return True
+            cr = find(b"\r", cr + 2)
+        return False
+
+    def rows(self) -> Iterator[List[bytes]]:
+        """Raw cells per row, honouring RFC 4180 quoting; blank lines are skipped.
+
+        Rows end at LF (with an optional CR before it). Files that use bare CR
+        line endings must go through the ``csv`` module instead; see
+        ``has_bare_cr``.
+
+        Unquoted runs are split on commas in one C call per run. Only quoted
+        cells (which may hold commas, doubled quotes and newlines) are walked
+        with ``find``.
+        """
+        buf, n = self._buf, len(self._buf)
+        find = buf.find
+        pos = self._start
+        nl = -1
+        while pos < n:
+            cells: List[bytes] = []
+            search = pos
+            while True:
+                if nl < pos:
+                    nl = find(b"\n", pos)
+                    if nl == -1:
+                        nl = n
+                quote = find(b'"', search, nl)
+                if quote > pos and buf[quote - 1] != 0x2C:
+                    search = quote + 1  # literal quote inside an unquoted cell
+                    continue
+                if quote == -1:
+                    end = nl - 1 if nl > pos and buf[nl - 1] == 0x0D else nl
+                    cells += buf[pos:end].split(b",")
+                    pos = nl + 1
+                    break
+                if quote > pos:
+                    cells += buf[pos:quote - 1].split(b",")
+                close = find(b'"', quote + 1)
+                while close != -1 and close + 1 < n and buf[close + 1] == 0x22:
+                    close = find(b'"', close + 2)
+                if close == -1:
+                    cells.append(buf[quote:n])
+                    pos = n
+                    break
+                cells.append(buf[quote:close + 1])
+                pos = search = close + 1
+                if pos < n and buf[pos] == 0x2C:
+                    pos = search = pos + 1
+                    continue
+                # stray bytes after a closing quote are dropped up to the next delimiter
+                if nl < pos:
+                    nl = find(b"\n", pos)
+                    if nl == -1:
+                        nl = n
+                comma = find(b",", pos, nl)
+                if comma != -1:
+                    pos = search = comma + 1
+                    continue
+                pos = nl + 1
+                break
+            if len(cells) > 1 or cells[0]:
+                yield cells
+
+
+class BareCrLineEndings(ValueError):
+    """The file uses bare CR line endings, which the mapped reader does not split on."""
+
+
+class ScoresheetLayout:
+    """Column positions resolved once from the header row.
+
+    Mirrors the dict-per-row semantics of ``open_file``. A row only has the
+    headers whose first column it reaches, in first-seen order. The first two
+    are the name and grade. When a header is repeated, the last of its columns
+    that is present in the row wins.
+    """
+
+    def __init__(self, headers: List[str]):
+        self.headers = headers
+        self.columns: Dict[str, List[int]] = {}
+        for i, h in enumerate(headers):
+            self.columns.setdefault(h, []).append(i)
+        # Rows of the same width always resolve to the same columns
+        self._plans: Dict[int, tuple] = {}
+
+    def _plan(self, width: int) -> tuple:
+        value_col = {h: next(c for c in reversed(cols) if c < width)
+                     for h, cols in self.columns.items() if cols[0] < width}
+        keys = list(value_col)
+        if len(keys) < 2:
+            return None
+        cols = [value_col[h] for h in keys[2:]]
+        ordered = cols == sorted(cols)
+        # In column order the hits already come out in header order; otherwise
+        # carry the header's rank and sort the (rarely more than a few) hits
+        assignments = {col: (h if ordered else (rank, h)) for rank, (h, col) in enumerate(zip(keys[2:], cols))}
+        return value_col[keys[0]], value_col[keys[1]], assignments, ordered
+
+    def cells_for(self, cells: List[bytes]) -> Tuple[bytes, bytes, List[str]]:
+        """Name cell, grade cell and missing assignment headers for one row."""
+        width = len(cells)
+        plan = self._plans.get(width)
+        if plan is None:
+            plan = self._plans[width] = self._plan(width)
+            if plan is None:
+                raise IndexError("scoresheet row is missing the name or grade column")
+        name_col, grade_col, assignments, ordered = plan
+        zero_cols = compress(range(width), map(_ZEROS.__contains__, cells))
+        hits = [assignments[col] for col in zero_cols if col in assignments]
+        if not ordered:
+            hits = [h for _, h in sorted(hits)]
+        return cells[name_col], cells[grade_col], hits
+
+
+def read_students(path: str, subject: str, message: str) -> List[Student]:
+    """Build Student objects straight from the mapped file.
+
+    Raises ``BareCrLineEndings`` for files the mapped reader cannot split. A
+    header-only file gives an empty list, as ``open_file`` does.
+    """
+    with MappedCsv(path) as csv_file:
+        if csv_file.has_bare_cr():
+            raise BareCrLineEndings(f"{path} uses bare CR line endings")
+        rows = csv_file.rows()
+        header: Optional[List[bytes]] = next(rows, None)
+        if header is None:
+            raise ValueError("scoresheet has no header row")
+        layout = ScoresheetLayout([decode_cell(cell) for cell in header])
+        if len(layout.columns) < 2:
+            raise IndexError("scoresheet has no grade column")
+
+        students = []
+        for cells in rows:
+            name, grade, missing = layout.cells_for(cells)
+            students.append(Student.from_values(decode_cell(name), decode_cell(grade), missing, subject, message))
+        return students
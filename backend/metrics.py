@@ -0,0 +1,76 @@
+# backend/metrics.py
+from __future__ import annotations
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Optional
+
+Sink = Optional[Callable[..., None]]
+
+_NULL_STAGE = nullcontext()
+
+
+class Metrics:
+    """Stage timings and counters for one run.
+
+    ``sink`` receives a ``("timing", stage=..., seconds=...)`` call as each
+    stage finishes, which lets the CLI stream them as they happen.
+    """
+    enabled = True
+
+    def __init__(self, sink: Sink = None):
+        self._sink = sink
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if self._sink:
+                self._sink("timing", stage=name, seconds=round(elapsed, 6))
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "timings": {k: round(v, 6) for k, v in self.timings.items()},
+            "calls": dict(self.calls),
+        }
+
+
+class _DisabledMetrics:
+    """Default recorder: every call is a constant-time no-op."""
+    enabled = False
+
+    def stage(self, name: str):
+        return _NULL_STAGE
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def snapshot(self) -> dict:
+        return {"counters": {}, "timings": {}, "calls": {}}
+
+
+DISABLED = _DisabledMetrics()
+_current = DISABLED
+
+
+def current_metrics():
+    return _current
+
+
+def set_metrics(metrics) -> object:
+    """Install ``metrics`` as the active recorder and return the previous one."""
+    global _current
+    previous = _current
+    _current = metrics if metrics is not None else DISABLED
+    return previous
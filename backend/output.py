@@ -0,0 +1,141 @@
+# backend/output.py
+from __future__ import annotations
+import logging
+import os
+import tempfile
+import time
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple, Union
+
+log = logging.getLogger(__name__)
+
+# name -> (zip method, deflate level); "stored" skips compression entirely
+COMPRESSION_PRESETS = {
+    "stored": (zipfile.ZIP_STORED, None),
+    "fast": (zipfile.ZIP_DEFLATED, 1),
+    "default": (zipfile.ZIP_DEFLATED, 6),
+    "best": (zipfile.ZIP_DEFLATED, 9),
+}
+COMPRESSION_LEVELS = [*COMPRESSION_PRESETS, *(str(i) for i in range(10))]
+
+
+def compression_options(level: Union[str, int]) -> Tuple[int, Optional[int]]:
+    """Map a preset name or a 0-9 deflate level to ``ZipFile`` arguments (0 means stored)."""
+    key = str(level).strip().lower()
+    if key in COMPRESSION_PRESETS:
+        return COMPRESSION_PRESETS[key]
+    if key.isdigit() and 0 <= int(key) <= 9:
+        return (zipfile.ZIP_STORED, None) if key == "0" else (zipfile.ZIP_DEFLATED, int(key))
+    raise ValueError(f"unknown compression level {level!r}; expected one of {', '.join(COMPRESSION_LEVELS)}")
+
+
+@dataclass(frozen=True)
+class SaveResult:
+    path: str
+    bytes_written: int
+    seconds: float
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+@contextmanager
+def atomic_output(path: Union[str, os.PathLike]) -> Iterator[BinaryIO]:
+    """Write ``path`` via a temp file in the same directory, renamed over it on success.
+
+    A crash or exception part-way through leaves any existing file untouched
+    and removes the partial one, so a truncated report never appears.
+    """
+    path = os.fspath(path)
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if os.name == "posix":
+            # mkstemp creates 0600; give the report the permissions a plain open() would
+            os.chmod(temp_path, 0o666 & ~_umask())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def save_atomic(path: Union[str, os.PathLike], write: Callable[[BinaryIO], None]) -> SaveResult:
+    """Run ``write(stream)`` into ``path`` atomically and report size and time."""
+    start = time.perf_counter()
+    with atomic_output(path) as f:
+        write(f)
+        size = f.tell()
+    return SaveResult(os.fspath(path), size, time.perf_counter() - start)
+
+
+# python-docx has no compression setting, so write_docx repeats the steps of
+# OpcPackage.save with its own zip writer. Those steps are private; they are
+# only used on the release they were checked against.
+_DOCX_SAVE_VERSION = "1.2.0"
+_DOCX_SAVE_STEPS = ("_write_content_types_stream", "_write_pkg_rels", "_write_parts")
+
+
+class _ZipPartWriter:
+    """python-docx's zip package writer, with the compression chosen up front."""
+
+    def __init__(self, stream: BinaryIO, method: int, level: Optional[int]):
+        self._zipf = zipfile.ZipFile(stream, "w", compression=method, compresslevel=level)
+
+    def write(self, pack_uri, blob: bytes):
+        self._zipf.writestr(pack_uri.membername, blob)
+
+    def close(self):
+        self._zipf.close()
+
+
+def _package_writer():
+    """python-docx's ``PackageWriter`` if this release saves the way write_docx expects, else None."""
+    import docx
+    from docx.opc.pkgwriter import PackageWriter
+
+    if docx.__version__ != _DOCX_SAVE_VERSION or not all(hasattr(PackageWriter, s) for s in _DOCX_SAVE_STEPS):
+        return None
+    return PackageWriter
+
+
+def write_docx(doc, stream: BinaryIO, compression: Union[str, int] = "default"):
+    """``doc.save(stream)`` with the zip compression chosen by ``compression``.
+
+    The default level is a plain ``doc.save``. Other levels write each part
+    once, straight into a zip opened with that compression. On a python-docx
+    release other than the pinned one the document is saved at the default
+    level with a warning.
+    """
+    method, level = compression_options(compression)
+    writer = None if (method, level) == COMPRESSION_PRESETS["default"] else _package_writer()
+    if writer is None:
+        if (method, level) != COMPRESSION_PRESETS["default"]:
+            import docx
+
+            log.warning("Compression %r needs python-docx %s (found %s); saving at the default level",
+                        compression, _DOCX_SAVE_VERSION, docx.__version__)
+        doc.save(stream)
+        return
+    package = doc.part.package
+    for part in package.parts:
+        part.before_marshal()
+    zip_writer = _ZipPartWriter(stream, method, level)
+    try:
+        parts = package.parts
+        writer._write_content_types_stream(zip_writer, parts)
+        writer._write_pkg_rels(zip_writer, package.rels)
+        writer._write_parts(zip_writer, parts)
+    finally:
+        zip_writer.close()
@@ -0,0 +1,789 @@
+# backend/pdf_report.py
+"""Direct-to-PDF rendering of the parent letters, for bulk printing without Word.
+
+Pages are written to the output stream as soon as they are complete; only
+object offsets and the set of used glyphs are kept, so memory stays flat for
+thousands of letters. The logo image and fonts are written once and shared
+by every page. Latin text uses the built-in Helvetica; Arabic (and anything
+else outside Windows-1252) uses an embedded TrueType font, with contextual
+shaping and right-to-left line layout.
+"""
+from __future__ import annotations
+import logging
+import os
+import re
+import struct
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from .attendanceData import AttendanceData
+from .letter import LetterWriter
+from .logo import LogoAsset, load_logo
+from .metrics import current_metrics
+from .progress import ProgressFn, scaled
+from .student import Student
+
+log = logging.getLogger(__name__)
+
+# US Letter, 1" margins and a 0.5" header like the python-docx template
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN = 72
+HEADER_TOP = 36
+LOGO_SIZE = 72
+FONT_SIZE = 12
+LEADING = 14
+BODY_TOP = PAGE_HEIGHT - HEADER_TOP - LOGO_SIZE - 18
+TAB = "    "
+
+LRE, PDF_MARK = "\u202A", "\u202C"
+
+# Fonts with Arabic presentation forms, first match wins
+FONT_CANDIDATES = [
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts", name)
+    for name in ("arial.ttf", "tahoma.ttf", "segoeui.ttf")
+] + [
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansArabic-Regular.ttf",
+    "/usr/share/fonts/truetype/freefont/FreeSerif.ttf",
+]
+
+# Helvetica advance widths (AFM, 1/1000 em) for ASCII 32..126
+_HELVETICA_ASCII = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+HELVETICA_WIDTHS: Dict[str, int] = {chr(32 + i): w for i, w in enumerate(_HELVETICA_ASCII)}
+
+
+def find_unicode_font() -> Optional[str]:
+    for path in FONT_CANDIDATES:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+# ---------------------------------------------------------------- fonts
+
+class TrueTypeFont:
+    """Just enough of a TrueType parser to embed a font as a CID font."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        if self.data[:4] not in (b"\x00\x01\x00\x00", b"true"):
+            raise ValueError(f"{path} is not a single TrueType font")
+        self.name = re.sub(r"[^A-Za-z0-9-]", "", os.path.splitext(os.path.basename(path))[0]) or "Embedded"
+
+        num_tables = struct.unpack(">H", self.data[4:6])[0]
+        self._tables = {}
+        for i in range(num_tables):
+            tag, _, offset, length = struct.unpack(">4sIII", self.data[12 + 16 * i:28 + 16 * i])
+            self._tables[tag.decode("latin-1")] = (offset, length)
+
+        head = self._table("head")
+        self.units_per_em = struct.unpack(">H", head[18:20])[0]
+        self.bbox = [self._scale(v) for v in struct.unpack(">hhhh", head[36:44])]
+        hhea = self._table("hhea")
+        ascent, descent = struct.unpack(">hh", hhea[4:8])
+        self.ascent, self.descent = self._scale(ascent), self._scale(descent)
+        num_metrics = struct.unpack(">H", hhea[34:36])[0]
+        hmtx = self._table("hmtx")
+        self._advances = [struct.unpack(">H", hmtx[4 * i:4 * i + 2])[0] for i in range(num_metrics)]
+        self.cmap = self._parse_cmap()
+
+    def _table(self, tag: str) -> bytes:
+        offset, length = self._tables[tag]
+        return self.data[offset:offset + length]
+
+    def _scale(self, value: int) -> int:
+        return int(round(value * 1000 / self.units_per_em))
+
+    def _parse_cmap(self) -> Dict[int, int]:
+        cmap = self._table("cmap")
+        count = struct.unpack(">H", cmap[2:4])[0]
+        subtables = {}
+        for i in range(count):
+            platform, encoding, offset = struct.unpack(">HHI", cmap[4 + 8 * i:12 + 8 * i])
+            subtables[(platform, encoding)] = offset
+        for key in ((3, 10), (0, 4), (3, 1), (0, 3)):
+            if key not in subtables:
+                continue
+            offset = subtables[key]
+            fmt = struct.unpack(">H", cmap[offset:offset + 2])[0]
+            if fmt == 12:
+                return self._cmap_format12(cmap, offset)
+            if fmt == 4:
+                return self._cmap_format4(cmap, offset)
+        raise ValueError("no usable unicode cmap")
+
+    @staticmethod
+    def _cmap_format4(cmap: bytes, offset: int) -> Dict[int, int]:
+        seg_count = struct.unpack(">H", cmap[offset + 6:offset + 8])[0] // 2
+        ends = struct.unpack(f">{seg_count}H", cmap[offset + 14:offset + 14 + 2 * seg_count])
+        base = offset + 16 + 2 * seg_count
+        starts = struct.unpack(f">{seg_count}H", cmap[base:base + 2 * seg_count])
+        deltas = struct.unpack(f">{seg_count}h", cmap[base + 2 * seg_count:base + 4 * seg_count])
+        range_base = base + 4 * seg_count
+        range_offsets = struct.unpack(f">{seg_count}H", cmap[range_base:range_base + 2 * seg_count])
+        mapping = {}
+        for i in range(seg_count):
+            for code in range(starts[i], ends[i] + 1):
+                if code == 0xFFFF:
+                    continue
+                if range_offsets[i] == 0:
+                    gid = (code + deltas[i]) & 0xFFFF
+                else:
+                    addr = range_base + 2 * i + range_offsets[i] + 2 * (code - starts[i])
+                    gid = struct.unpack(">H", cmap[addr:addr + 2])[0]
+                    if gid:
+                        gid = (gid + deltas[i]) & 0xFFFF
+                if gid:
+                    mapping[code] = gid
+        return mapping
+
+    @staticmethod
+    def _cmap_format12(cmap: bytes, offset: int) -> Dict[int, int]:
+        groups = struct.unpack(">I", cmap[offset + 12:offset + 16])[0]
+        mapping = {}
+        for i in range(groups):
+            start, end, gid = struct.unpack(">III", cmap[offset + 16 + 12 * i:offset + 28 + 12 * i])
+            for code in range(start, end + 1):
+                mapping[code] = gid + code - start
+        return mapping
+
+    def glyph(self, ch: str) -> int:
+        return self.cmap.get(ord(ch), 0)
+
+    def advance(self, gid: int) -> int:
+        advances = self._advances
+        return self._scale(advances[gid] if gid < len(advances) else advances[-1])
+
+
+def _helvetica_width(ch: str) -> int:
+    width = HELVETICA_WIDTHS.get(ch)
+    if width is None:
+        # Accented Latin letters are as wide as their base letter
+        base = unicodedata.normalize("NFKD", ch)[:1]
+        width = HELVETICA_WIDTHS.get(base, 556)
+    return width
+
+
+def _helvetica_can_encode(ch: str) -> bool:
+    try:
+        ch.encode("cp1252")
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+# ---------------------------------------------------------------- arabic
+
+# char -> (first presentation form, number of forms); forms are ordered
+# isolated, final, initial, medial. Two-form letters only join to the right.
+_ARABIC_FORMS: Dict[str, Tuple[int, int]] = {
+    "\u0621": (0xFE80, 1), "\u0622": (0xFE81, 2), "\u0623": (0xFE83, 2), "\u0624": (0xFE85, 2),
+    "\u0625": (0xFE87, 2), "\u0626": (0xFE89, 4), "\u0627": (0xFE8D, 2), "\u0628": (0xFE8F, 4),
+    "\u0629": (0xFE93, 2), "\u062A": (0xFE95, 4), "\u062B": (0xFE99, 4), "\u062C": (0xFE9D, 4),
+    "\u062D": (0xFEA1, 4), "\u062E": (0xFEA5, 4), "\u062F": (0xFEA9, 2), "\u0630": (0xFEAB, 2),
+    "\u0631": (0xFEAD, 2), "\u0632": (0xFEAF, 2), "\u0633": (0xFEB1, 4), "\u0634": (0xFEB5, 4),
+    "\u0635": (0xFEB9, 4), "\u0636": (0xFEBD, 4), "\u0637": (0xFEC1, 4), "\u0638": (0xFEC5, 4),
+    "\u0639": (0xFEC9, 4), "\u063A": (0xFECD, 4), "\u0641": (0xFED1, 4), "\u0642": (0xFED5, 4),
+    "\u0643": (0xFED9, 4), "\u0644": (0xFEDD, 4), "\u0645": (0xFEE1, 4), "\u0646": (0xFEE5, 4),
+    "\u0647": (0xFEE9, 4), "\u0648": (0xFEED, 2), "\u0649": (0xFEEF, 2), "\u064A": (0xFEF1, 4),
+}
+# lam + alef variant -> (isolated, final) ligature
+_LAM_ALEF = {"\u0622": 0xFEF5, "\u0623": 0xFEF7, "\u0625": 0xFEF9, "\u0627": 0xFEFB}
+_TATWEEL = "\u0640"
+
+
+def _is_transparent(ch: str) -> bool:
+    return unicodedata.category(ch) == "Mn"
+
+
+def _joins_left(ch: Optional[str]) -> bool:
+    return ch == _TATWEEL or (ch in _ARABIC_FORMS and _ARABIC_FORMS[ch][1] == 4)
+
+
+def _joins_right(ch: Optional[str]) -> bool:
+    return ch == _TATWEEL or (ch in _ARABIC_FORMS and _ARABIC_FORMS[ch][1] >= 2)
+
+
+def shape_arabic(text: str) -> str:
+    """Replace Arabic letters with their contextual presentation forms (logical order)."""
+    if not any(ch in _ARABIC_FORMS for ch in text):
+        return text
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch not in _ARABIC_FORMS:
+            out.append(ch)
+            i += 1
+            continue
+        prev = next((text[j] for j in range(i - 1, -1, -1) if not _is_transparent(text[j])), None)
+        nxt_index = next((j for j in range(i + 1, n) if not _is_transparent(text[j])), None)
+        nxt = text[nxt_index] if nxt_index is not None else None
+        joined_before = _joins_left(prev)
+
+        if ch == "\u0644" and nxt in _LAM_ALEF:
+            out.append(chr(_LAM_ALEF[nxt] + (1 if joined_before else 0)))
+            out.extend(text[i + 1:nxt_index])  # keep any harakat between lam and alef
+            i = nxt_index + 1
+            continue
+
+        base, forms = _ARABIC_FORMS[ch]
+        joined_after = forms == 4 and _joins_right(nxt)
+        if forms == 1:
+            form = 0
+        elif joined_before and joined_after:
+            form = 3
+        elif joined_before:
+            form = 1
+        elif joined_after:
+            form = 2
+        else:
+            form = 0
+        out.append(chr(base + form))
+        i += 1
+    return "".join(out)
+
+
+def _is_rtl(ch: str) -> bool:
+    return unicodedata.bidirectional(ch) in ("R", "AL")
+
+
+def _strong(ch: str) -> Optional[str]:
+    if _is_rtl(ch):
+        return "R"
+    if unicodedata.bidirectional(ch) in ("L", "EN", "AN"):
+        return "L"
+    return None
+
+
+_MIRROR = str.maketrans("()[]{}<>", ")(][}{><")
+
+
+def paragraph_direction(text: str) -> str:
+    """'R' when the first strong character outside LRE..PDF spans is right-to-left."""
+    forced = 0
+    for ch in text:
+        if ch == LRE:
+            forced += 1
+        elif ch == PDF_MARK:
+            forced = max(0, forced - 1)
+        elif not forced:
+            kind = _strong(ch)
+            if kind:
+                return kind
+    return "L"
+
+
+def visual_runs(line: str, base: str) -> List[str]:
+    """Reorder one wrapped line for display (a simplified UAX #9).
+
+    Text inside LRE..PDF is always left-to-right; neutral characters take the
+    direction of matching neighbours, otherwise the paragraph direction.
+    """
+    if base == "L" and LRE not in line and not any(_is_rtl(ch) for ch in line):
+        return [line]
+
+    chars, kinds, forced = [], [], 0
+    for ch in line:
+        if ch == LRE:
+            forced += 1
+            continue
+        if ch == PDF_MARK:
+            forced = max(0, forced - 1)
+            continue
+        chars.append(ch)
+        kinds.append("L" if forced and not ch.isspace() else _strong(ch))
+
+    # Resolve neutrals between the surrounding strong types
+    resolved = list(kinds)
+    i = 0
+    while i < len(resolved):
+        if resolved[i] is not None:
+            i += 1
+            continue
+        j = i
+        while j < len(resolved) and resolved[j] is None:
+            j += 1
+        before = resolved[i - 1] if i > 0 else base
+        after = resolved[j] if j < len(resolved) else base
+        fill = before if before == after else base
+        for k in range(i, j):
+            resolved[k] = fill
+        i = j
+
+    runs: List[Tuple[str, List[str]]] = []
+    for ch, kind in zip(chars, resolved):
+        if runs and runs[-1][0] == kind:
+            runs[-1][1].append(ch)
+        else:
+            runs.append((kind, [ch]))
+
+    ordered = reversed(runs) if base == "R" else runs
+    return ["".join(reversed(text)).translate(_MIRROR) if kind == "R" else "".join(text)
+            for kind, text in ordered]
+
+
+# ---------------------------------------------------------------- images
+
+def _jpeg_xobject(data: bytes) -> Optional[Tuple[str, bytes]]:
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        length = struct.unpack(">H", data[i + 2:i + 4])[0]
+        if marker in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            components = data[i + 9]
+            space = {1: "/DeviceGray", 3: "/DeviceRGB", 4: "/DeviceCMYK"}.get(components)
+            if not space:
+                return None
+            extra = " /Decode [1 0 1 0 1 0 1 0]" if components == 4 else ""
+            return (f"/Width {width} /Height {height} /ColorSpace {space} /BitsPerComponent 8 "
+                    f"/Filter /DCTDecode{extra}", data)
+        i += 2 + length
+    return None
+
+
+def _png_unfilter(raw: bytes, width: int, height: int, bpp: int) -> bytearray:
+    stride = width * bpp
+    out = bytearray(stride * height)
+    prev = bytearray(stride)
+    pos = 0
+    for row in range(height):
+        ftype = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if ftype == 1:
+            for x in range(bpp, stride):
+                line[x] = (line[x] + line[x - bpp]) & 0xFF
+        elif ftype == 2:
+            for x in range(stride):
+                line[x] = (line[x] + prev[x]) & 0xFF
+        elif ftype == 3:
+            for x in range(stride):
+                left = line[x - bpp] if x >= bpp else 0
+                line[x] = (line[x] + ((left + prev[x]) >> 1)) & 0xFF
+        elif ftype == 4:
+            for x in range(stride):
+                a = line[x - bpp] if x >= bpp else 0
+                b = prev[x]
+                c = prev[x - bpp] if x >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                pred = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+                line[x] = (line[x] + pred) & 0xFF
+        out[row * stride:(row + 1) * stride] = line
+        prev = line
+    return out
+
+
+def _png_xobject(data: bytes):
+    """Returns (image dict, image data, optional (smask dict, smask data))."""
+    pos, idat, palette = 8, [], None
+    width = height = depth = ctype = interlace = 0
+    while pos + 8 <= len(data):
+        length, tag = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if tag == b"IHDR":
+            width, height, depth, ctype, _, _, interlace = struct.unpack(">IIBBBBB", body)
+        elif tag == b"PLTE":
+            palette = body
+        elif tag == b"IDAT":
+            idat.append(body)
+        elif tag == b"IEND":
+            break
+        pos += 12 + length
+    if not width or interlace:
+        return None
+    stream = b"".join(idat)
+
+    if ctype in (0, 2, 3):
+        # No alpha: hand the zlib data to the viewer with the PNG predictor
+        colors = {0: 1, 2: 3, 3: 1}[ctype]
+        if ctype == 3:
+            if not palette:
+                return None
+            space = f"[/Indexed /DeviceRGB {len(palette) // 3 - 1} <{palette.hex()}>]"
+        else:
+            space = "/DeviceGray" if ctype == 0 else "/DeviceRGB"
+        params = f"/DecodeParms << /Predictor 15 /Colors {colors} /BitsPerComponent {depth} /Columns {width} >>"
+        return (f"/Width {width} /Height {height} /ColorSpace {space} /BitsPerComponent {depth} "
+                f"/Filter /FlateDecode {params}", stream, None)
+
+    if ctype in (4, 6) and depth == 8:
+        colors = 1 if ctype == 4 else 3
+        bpp = colors + 1
+        pixels = _png_unfilter(zlib.decompress(stream), width, height, bpp)
+        alpha = pixels[colors::bpp]
+        if colors == 1:
+            color = pixels[0::bpp]
+        else:
+            color = bytearray(width * height * 3)
+            color[0::3], color[1::3], color[2::3] = pixels[0::bpp], pixels[1::bpp], pixels[2::bpp]
+        space = "/DeviceGray" if colors == 1 else "/DeviceRGB"
+        image = (f"/Width {width} /Height {height} /ColorSpace {space} /BitsPerComponent 8 "
+                 f"/Filter /FlateDecode", zlib.compress(bytes(color)))
+        smask = (f"/Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                 f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode",
+                 zlib.compress(bytes(alpha)))
+        return image[0], image[1], smask
+    return None
+
+
+def image_xobject(asset: LogoAsset):
+    """Decode a logo into PDF image parts, or None if the format is unsupported."""
+    if asset.data[:2] == b"\xff\xd8":
+        parsed = _jpeg_xobject(asset.data)
+        return (parsed[0], parsed[1], None) if parsed else None
+    if asset.data[:8] == b"\x89PNG\r\n\x1a\n":
+        return _png_xobject(asset.data)
+    return None
+
+
+# ---------------------------------------------------------------- writer
+
+def _pdf_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").replace("\r", "")
+
+
+class _PdfStream:
+    """Incremental PDF object writer; only object offsets stay in memory."""
+
+    def __init__(self, out: BinaryIO):
+        self._out = out
+        self._pos = 0
+        self._offsets: Dict[int, int] = {}
+        self._next_id = 1
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def bytes_written(self) -> int:
+        return self._pos
+
+    def _write(self, data: bytes):
+        self._out.write(data)
+        self._pos += len(data)
+
+    def reserve(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def write_object(self, obj_id: int, body: str):
+        self._offsets[obj_id] = self._pos
+        self._write(f"{obj_id} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    def write_stream(self, obj_id: int, entries: str, data: bytes, compress: bool = False):
+        if compress:
+            data = zlib.compress(data)
+            entries = f"{entries} /Filter /FlateDecode".strip()
+        self._offsets[obj_id] = self._pos
+        self._write(f"{obj_id} 0 obj\n<< {entries} /Length {len(data)} >>\nstream\n".encode("latin-1"))
+        self._write(data)
+        self._write(b"\nendstream\nendobj\n")
+
+    def close(self, root_id: int):
+        xref = self._pos
+        size = self._next_id
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        for obj_id in range(1, size):
+            lines.append(f"{self._offsets.get(obj_id, 0):010d} 00000 n \n")
+        lines.append(f"trailer\n<< /Size {size} /Root {root_id} 0 R >>\nstartxref\n{xref}\n%%EOF\n")
+        self._write("".join(lines).encode("latin-1"))
+
+
+class PdfLetterRenderer:
+    """Lays letters out on pages and streams them into a PDF."""
+
+    def __init__(self, settings, out: BinaryIO, font_path: Optional[str] = None,
+                 logo: Optional[LogoAsset] = None):
+        self._pdf = _PdfStream(out)
+        self._catalog_id = self._pdf.reserve()
+        self._pages_id = self._pdf.reserve()
+        self._helvetica_id = self._pdf.reserve()
+        self._page_ids: List[int] = []
+        self._closed = False
+
+        self._ttf: Optional[TrueTypeFont] = None
+        self._ttf_id: Optional[int] = None
+        self._used_glyphs: Dict[int, str] = {}
+        font_path = font_path or find_unicode_font()
+        if font_path:
+            try:
+                self._ttf = TrueTypeFont(font_path)
+            except (OSError, ValueError, KeyError, struct.error) as e:
+                log.warning("Could not load font %s: %s", font_path, e)
+
+        self._logo_id = self._write_logo(logo if logo is not None else load_logo(settings))
+        # Header lines are shaped and reordered once, like letter paragraphs
+        self._details: List[List[str]] = []
+        for line in (settings.school_name, settings.school_address, settings.teacher_email):
+            line = shape_arabic(line or "")
+            self._details.append(visual_runs(line, paragraph_direction(line)) if line else [])
+        self._ops: List[str] = []
+        self._page_uses_ttf = False
+        self._char_cache: Dict[str, Tuple[str, float]] = {}
+        self._y = 0.0
+
+    # -- resources, written once and shared by all pages
+
+    def _write_logo(self, asset: Optional[LogoAsset]) -> Optional[int]:
+        if asset is None:
+            return None
+        parts = image_xobject(asset)
+        if parts is None:
+            log.warning("Logo format not supported in PDF output; omitting it")
+            return None
+        entries, data, smask = parts
+        smask_ref = ""
+        if smask is not None:
+            smask_id = self._pdf.reserve()
+            self._pdf.write_stream(smask_id, smask[0], smask[1])
+            smask_ref = f" /SMask {smask_id} 0 R"
+        image_id = self._pdf.reserve()
+        self._pdf.write_stream(image_id, f"/Type /XObject /Subtype /Image {entries}{smask_ref}", data)
+        return image_id
+
+    def _resources(self) -> str:
+        fonts = f"/F1 {self._helvetica_id} 0 R"
+        if self._page_uses_ttf:
+            # The (large) TrueType font is only embedded once some page needs it
+            if self._ttf_id is None:
+                self._ttf_id = self._pdf.reserve()
+            fonts += f" /F2 {self._ttf_id} 0 R"
+        xobjects = f" /XObject << /Logo {self._logo_id} 0 R >>" if self._logo_id else ""
+        return f"<< /Font << {fonts} >>{xobjects} >>"
+
+    # -- text measurement and drawing
+
+    def _char_info(self, ch: str) -> Tuple[str, float]:
+        """(font resource, advance in points), memoised per character."""
+        info = self._char_cache.get(ch)
+        if info is None:
+            if ch in (LRE, PDF_MARK):
+                info = ("F1", 0.0)
+            elif _helvetica_can_encode(ch) and not _is_rtl(ch):
+                info = ("F1", _helvetica_width(ch) * FONT_SIZE / 1000)
+            elif self._ttf is not None and self._ttf.glyph(ch):
+                info = ("F2", self._ttf.advance(self._ttf.glyph(ch)) * FONT_SIZE / 1000)
+            else:
+                info = ("F1", _helvetica_width("?") * FONT_SIZE / 1000)
+            self._char_cache[ch] = info
+        return info
+
+    def _font_for(self, ch: str) -> str:
+        return self._char_info(ch)[0]
+
+    def text_width(self, text: str) -> float:
+        info = self._char_info
+        return sum(info(ch)[1] for ch in text)
+
+    def _show(self, text: str) -> List[str]:
+        """Tj operators for ``text`` (visual order), switching fonts as needed."""
+        ops, chunk, font = [], [], None
+        for ch in text + "\0":
+            f = self._font_for(ch) if ch != "\0" else None
+            if f != font and chunk:
+                if font == "F2":
+                    self._page_uses_ttf = True
+                    gids = [self._ttf.glyph(c) for c in chunk]
+                    for c, gid in zip(chunk, gids):
+                        self._used_glyphs.setdefault(gid, c)
+                    ops.append(f"/F2 {FONT_SIZE} Tf <{''.join(f'{g:04X}' for g in gids)}> Tj")
+                else:
+                    encoded = "".join(chunk).encode("cp1252", "replace").decode("latin-1")
+                    ops.append(f"/F1 {FONT_SIZE} Tf ({_pdf_string(encoded)}) Tj")
+                chunk = []
+            font = f
+            chunk.append(ch)
+        return ops
+
+    def _draw_line(self, runs: Sequence[str], x: float, y: float):
+        ops = [op for run in runs for op in self._show(run)]
+        if ops:
+            self._ops.append(f"BT 1 0 0 1 {x:.2f} {y:.2f} Tm " + " ".join(ops) + " ET")
+
+    def _wrap(self, text: str, width: float) -> List[str]:
+        """Greedy word wrap in logical order; LRE..PDF spans are re-opened across breaks."""
+        words = re.split(r"( +)", text)
+        lines, current, current_w = [], "", 0.0
+        for word in words:
+            if not word:
+                continue
+            w = self.text_width(word)
+            if current and not word.isspace() and current_w + w > width:
+                lines.append(current.rstrip(" "))
+                current, current_w = "", 0.0
+            if not current and word.isspace():
+                continue
+            current += word
+            current_w += w
+        lines.append(current.rstrip(" "))
+
+        balanced, carry = [], 0
+        for line in lines:
+            opened = carry
+            carry = max(0, carry + line.count(LRE) - line.count(PDF_MARK))
+            balanced.append(LRE * opened + line + PDF_MARK * carry)
+        return balanced
+
+    # -- pages
+
+    def _start_page(self):
+        ops = self._ops = []
+        if self._logo_id:
+            ops.append(f"q {LOGO_SIZE} 0 0 {LOGO_SIZE} {MARGIN} {PAGE_HEIGHT - HEADER_TOP - LOGO_SIZE} cm /Logo Do Q")
+        y = PAGE_HEIGHT - HEADER_TOP - FONT_SIZE
+        for runs in self._details:
+            if runs:
+                self._draw_line(runs, PAGE_WIDTH - MARGIN - self.text_width("".join(runs)), y)
+            y -= LEADING
+        self._y = BODY_TOP
+
+    def _finish_page(self):
+        if not self._ops:
+            return
+        content_id = self._pdf.reserve()
+        self._pdf.write_stream(content_id, "", "\n".join(self._ops).encode("latin-1"), compress=True)
+        page_id = self._pdf.reserve()
+        self._pdf.write_object(
+            page_id,
+            f"<< /Type /Page /Parent {self._pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources {self._resources()} /Contents {content_id} 0 R >>",
+        )
+        self._page_ids.append(page_id)
+        self._ops = []
+        self._page_uses_ttf = False
+        current_metrics().count("pages_rendered")
+
+    def add_letter(self, text: str):
+        """Render one letter starting on a fresh page, flowing onto more pages if needed."""
+        self._finish_page()
+        self._start_page()
+        width = PAGE_WIDTH - 2 * MARGIN
+        for paragraph in text.split("\n"):
+            paragraph = shape_arabic(paragraph.replace("\t", TAB))
+            base = paragraph_direction(paragraph)
+            for line in self._wrap(paragraph, width) if paragraph.strip() else [""]:
+                if self._y < MARGIN:
+                    self._finish_page()
+                    self._start_page()
+                if line:
+                    runs = visual_runs(line, base)
+                    x = MARGIN
+                    if base == "R":
+                        x = PAGE_WIDTH - MARGIN - self.text_width("".join(runs))
+                    self._draw_line(runs, x, self._y)
+                self._y -= LEADING
+
+    def close(self) -> int:
+        """Write shared resources, page tree and trailer; return bytes written."""
+        if self._closed:
+            return self._pdf.bytes_written
+        self._closed = True
+        self._finish_page()
+        if not self._page_ids:
+            self._start_page()
+            self._finish_page()
+
+        pdf = self._pdf
+        pdf.write_object(self._helvetica_id,
+                         "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        if self._ttf_id is not None:
+            self._write_ttf()
+        kids = " ".join(f"{p} 0 R" for p in self._page_ids)
+        pdf.write_object(self._pages_id, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>")
+        pdf.write_object(self._catalog_id, f"<< /Type /Catalog /Pages {self._pages_id} 0 R >>")
+        pdf.close(self._catalog_id)
+        return pdf.bytes_written
+
+    def _write_ttf(self):
+        pdf, ttf = self._pdf, self._ttf
+        file_id, descriptor_id, cid_id, tounicode_id = (pdf.reserve() for _ in range(4))
+        pdf.write_stream(file_id, f"/Length1 {len(ttf.data)}", ttf.data, compress=True)
+        pdf.write_object(descriptor_id, (
+            f"<< /Type /FontDescriptor /FontName /{ttf.name} /Flags 32 "
+            f"/FontBBox [{' '.join(map(str, ttf.bbox))}] /ItalicAngle 0 /Ascent {ttf.ascent} "
+            f"/Descent {ttf.descent} /CapHeight {ttf.ascent} /StemV 80 /FontFile2 {file_id} 0 R >>"
+        ))
+        glyphs = sorted(self._used_glyphs)
+        widths = " ".join(f"{g} [{ttf.advance(g)}]" for g in glyphs)
+        pdf.write_object(cid_id, (
+            f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{ttf.name} "
+            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+            f"/FontDescriptor {descriptor_id} 0 R /DW 1000 /W [{widths}] /CIDToGIDMap /Identity >>"
+        ))
+        mappings = [f"<{g:04X}> <{ord(self._used_glyphs[g]):04X}>" for g in glyphs
+                    if ord(self._used_glyphs[g]) <= 0xFFFF]
+        # A bfchar block may hold at most 100 entries
+        blocks = "".join(
+            f"{len(chunk)} beginbfchar\n" + "\n".join(chunk) + "\nendbfchar\n"
+            for chunk in (mappings[i:i + 100] for i in range(0, len(mappings), 100))
+        )
+        cmap = (
+            "/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n"
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+            "/CMapName /Adobe-Identity-UCS def /CMapType 2 def\n"
+            "1 begincodespacerange <0000> <FFFF> endcodespacerange\n"
+            f"{blocks}"
+            "endcmap CMapName currentdict /CMap defineresource pop end end"
+        )
+        pdf.write_stream(tounicode_id, "", cmap.encode("latin-1"), compress=True)
+        pdf.write_object(self._ttf_id, (
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{ttf.name} /Encoding /Identity-H "
+            f"/DescendantFonts [{cid_id} 0 R] /ToUnicode {tounicode_id} 0 R >>"
+        ))
+
+
+def render_report_pdf(
+    settings,
+    student_language_pairs: List[Tuple[Student, str]],
+    stream: BinaryIO,
+    attendance_data: Optional[Dict[str, AttendanceData]] = None,
+    on_progress: ProgressFn = None,
+    font_path: Optional[str] = None,
+) -> int:
+    """Stream the letters as a paginated PDF into ``stream``; return bytes written."""
+    attendance_data = attendance_data or {}
+    language_grouped_students = defaultdict(list)
+    for student, language in student_language_pairs:
+        language_grouped_students[language].append(student)
+
+    metrics = current_metrics()
+    total = sum(len(v) for v in language_grouped_students.values()) or 1
+    done = 0
+    if on_progress:
+        on_progress(0)
+    with metrics.stage("build_pdf"):
+        renderer = PdfLetterRenderer(settings, stream, font_path)
+        for language, students in language_grouped_students.items():
+            language_progress = scaled(on_progress, 100 * done / total, 100 * (done + len(students)) / total)
+            writer = LetterWriter(settings.teacher_name, settings.teacher_email, language,
+                                  settings.custom_message, attendance_data, scaled(language_progress, 0, 10))
+            for i, student in enumerate(students, start=1):
+                renderer.add_letter(writer.generate_letter(student))
+                metrics.count("letters_rendered")
+                if language_progress:
+                    language_progress(10 + int(90 * i / len(students)))
+            done += len(students)
+        written = renderer.close()
+    metrics.count("bytes_written", written)
+    return written
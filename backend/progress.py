@@ -0,0 +1,59 @@
+# backend/progress.py
+from __future__ import annotations
+import time
+from typing import Callable, Optional
+
+ProgressFn = Optional[Callable[[int], None]]
+
+
+class ProgressReporter:
+    """Coalescing front for a progress sink (e.g. the CLI's JSON event stream).
+
+    Values are clamped to 0..100 and only ever move forward; repeats and
+    regressions are dropped. A new value is forwarded once it is at least
+    ``min_step`` points past the last one *and* ``min_interval`` seconds have
+    passed, so the number of events stays bounded no matter how many letters
+    are written. The first value and 100 are always forwarded; anything held
+    back is sent by ``flush()``.
+    """
+
+    def __init__(self, sink: Callable[[int], None], min_interval: float = 0.1, min_step: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        self._sink = sink
+        self.min_interval = max(0.0, min_interval)
+        self.min_step = max(1, int(min_step))
+        self._clock = clock
+        self._last = -1
+        self._last_time = 0.0
+        self._pending = -1
+
+    @property
+    def value(self) -> int:
+        return max(self._last, self._pending)
+
+    def __call__(self, value) -> None:
+        value = max(0, min(100, int(value)))
+        if value <= self.value:
+            return
+        now = self._clock()
+        if (self._last >= 0 and value < 100
+                and (value - self._last < self.min_step or now - self._last_time < self.min_interval)):
+            self._pending = value
+            return
+        self._send(value, now)
+
+    def flush(self) -> None:
+        if self._pending > self._last:
+            self._send(self._pending, self._clock())
+
+    def _send(self, value: int, now: float) -> None:
+        self._last, self._last_time, self._pending = value, now, -1
+        self._sink(value)
+
+
+def scaled(cb: ProgressFn, start: float, end: float) -> ProgressFn:
+    """Map a callback's 0..100 range onto ``start..end`` of ``cb``."""
+    if not cb:
+        return None
+    span = end - start
+    return lambda value: cb(int(start + span * value / 100))
@@ -1,22 +1,22 @@
-import csv
 import datetime
+import io
 import logging
-import os
-import tempfile
-import webbrowser
 from collections import defaultdict
 from pathlib import Path
-from typing import List, Callable, Optional, Dict, Tuple
+from typing import BinaryIO, List, Callable, Optional, Dict, Tuple
 
 import docx
 from docx import Document
 from docx.shared import Inches, Pt
-from xlsx2csv import Xlsx2csv
 
 from .attendance import parse_attendance_data
-from .logo import create_logo_image
+from .logo import LogoAsset, load_logo
+from .output import SaveResult, save_atomic, write_docx
+from .metrics import current_metrics
+from .progress import scaled
 from .attendanceData import AttendanceData
 from .letter import LetterWriter
+from .scoresheet import open_file, parse_students  # re-exported for existing callers
 from .student import Student
 
 log = logging.getLogger(__name__)
@@ -42,36 +42,7 @@ def progress(cb: ProgressFn, value: int):
     if cb:
         cb(int(value))
 
-def open_file(input_file: str):
-    if not input_file:
-        raise ValueError("input_file is required")
-
-    temp_csv_path = None
-    try:
-        if input_file.lower().endswith(".xlsx"):
-            fd, temp_csv_path = tempfile.mkstemp(suffix=".csv")
-            os.close(fd)
-            Xlsx2csv(input_file).convert(temp_csv_path)
-            source = temp_csv_path
-        else:
-            source = input_file
-
-        data = []
-        with open(source, "r", encoding="utf-8-sig", newline="") as f:
-            reader = csv.reader(f)
-            headers = next(reader)
-            for row in reader:
-                record = {headers[i]: row[i] for i in range(min(len(headers), len(row)))}
-                data.append(record)
-        return data
-    finally:
-        if temp_csv_path and os.path.exists(temp_csv_path):
-            try:
-                os.remove(temp_csv_path)
-            except OSError:
-                pass
-
-def setup_document(settings, output_dir: str) -> Document:
+def setup_document(settings, logo: Optional[LogoAsset] = None) -> Document:
     doc = Document()
     sect = doc.sections[0]
     header = sect.header
@@ -94,8 +65,10 @@ def setup_document(settings, output_dir: str) -> Document:
     logo_cell = header_table.cell(0, 0)
     logo_p = logo_cell.paragraphs[0]
     logo_p.alignment = docx.enum.text.WD_PARAGRAPH_ALIGNMENT.LEFT
-    logo_run = logo_p.add_run()
-    logo_run.add_picture(create_logo_image(settings, output_dir), width=Inches(1.0), height=Inches(1.0))
+    logo = logo if logo is not None else load_logo(settings)
+    if logo is not None:
+        # Embed straight from the decoded bytes; no temp file per report
+        logo_p.add_run().add_picture(logo.stream(), width=Inches(1.0), height=Inches(1.0))
 
     # Details (right cell)
     details_cell = header_table.cell(0, 1)
@@ -108,28 +81,64 @@ def setup_document(settings, output_dir: str) -> Document:
 
     return doc
 
-def parse_students(input_file: str, settings):
-    data = open_file(input_file)
+def add_summary_section(doc: Document, summary, class_name: str = "") -> Document:
+    """Counselor cover sheet built from an analytics.ClassSummary."""
+    doc.add_heading(f"{class_name} Class Summary".strip(), level=1)
+
+    lines = [f"Students: {summary.student_count}"]
+    if summary.grade_mean is not None:
+        lines.append(f"Average grade: {summary.grade_mean:.1f}%")
+    if summary.grade_percentiles:
+        lines.append("Grade percentiles: " + ", ".join(
+            f"{k.upper()} {v:.0f}%" for k, v in summary.grade_percentiles.items()))
+    if summary.attendance_count:
+        lines.append(f"Students with attendance data: {summary.attendance_count}")
+        lines.append(f"Average absence rate: {summary.absence_rate_mean:.1f}%")
+        lines.append(f"Average tardy rate: {summary.tardy_rate_mean:.1f}%")
+    p = doc.add_paragraph("\n".join(lines))
+    p.paragraph_format.space_after = Pt(6)
+
+    if summary.grade_distribution:
+        doc.add_heading("Grade distribution", level=2)
+        table = doc.add_table(rows=1, cols=2)
+        table.style = "Table Grid"
+        table.cell(0, 0).text, table.cell(0, 1).text = "Grade", "Students"
+        for grade, count in summary.grade_distribution.items():
+            row = table.add_row()
+            row.cells[0].text, row.cells[1].text = grade, str(count)
+
+    if summary.attendance_count:
+        doc.add_heading(f"Chronically absent (\u2265 {summary.chronic_absence_threshold:g}% of days)", level=2)
+        if summary.chronically_absent:
+            table = doc.add_table(rows=1, cols=3)
+            table.style = "Table Grid"
+            header = table.rows[0].cells
+            header[0].text, header[1].text, header[2].text = "Student", "Absences / Days", "Absent"
+            for entry in summary.chronically_absent:
+                row = table.add_row().cells
+                row[0].text = entry["name"]
+                row[1].text = f"{entry['absences']} / {entry['days']}"
+                row[2].text = f"{entry['percent_absent']:.1f}%"
+        else:
+            doc.add_paragraph("None")
 
-    students = []
-    for entry in data:
-        first_column = next(iter(entry))
-        _ = " ".join(reversed(entry[first_column].split(", ")))
-        student = Student(entry, settings.class_name, settings.custom_message)
-        students.append(student)
-    return students
+    doc.add_page_break()
+    return doc
 
 def generate_report_for_language(doc: Document, students: List[Student], settings, language: str, on_progress: ProgressFn, is_last: bool = True, attendance_data: Dict[str, AttendanceData] = {None}):
-    progress(on_progress, 10)
+    # LetterWriter reports 30..90 while translating its template; keep that
+    # below the letters' own 10..90 so the overall value never goes backwards
     writer = LetterWriter(
         settings.teacher_name,
         settings.teacher_email,
         language,
         settings.custom_message,
         attendance_data,
-        _ProgressAdapter(on_progress)
+        _ProgressAdapter(scaled(on_progress, 0, 10))
     )
+    progress(on_progress, 10)
 
+    metrics = current_metrics()
     total = len(students)
     for i, student in enumerate(students, start=1):
         p = doc.add_paragraph()
@@ -142,53 +151,140 @@ def generate_report_for_language(doc: Document, students: List[Student], setting
         # Page break only between students
         if i < total or not is_last:
             doc.add_page_break()
+        metrics.count("letters_rendered")
 
         progress(on_progress, 10 + int(80 * (i / max(1, total))))
     return doc
 
 
-def save_document(doc: Document, class_name: str) -> str:
-    out_dir = Path.home() / "Downloads"
-    out_dir.mkdir(parents=True, exist_ok=True)
+def default_output_dir() -> Path:
+    return Path.home() / "Downloads"
 
+def report_filename(class_name: str, extension: str = "docx") -> str:
     # Generate a concise timestamp (e.g., '20250815_115530')
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    clean_class_name = class_name.replace(' ', '_').replace('/', '_').replace('\\', '_').strip()    
-    output_filename = f"{clean_class_name}_{timestamp}.docx"
-    output_path = out_dir / output_filename
-    
-    try:
-        doc.save(output_path)
-        webbrowser.open(str(output_path))
-        return str(output_path)
-    except Exception as e:
-        log.debug(f"Error saving document to {output_path}: {e}")
-        return ""
 
-def generate_report_for_selected(
+    clean_class_name = class_name.replace(' ', '_').replace('/', '_').replace('\\', '_').strip()
+    return f"{clean_class_name}_{timestamp}.{extension}"
+
+def save_document(doc: Document, class_name: str, output_dir: Optional[str] = None,
+                  compression: str = "default") -> SaveResult:
+    out_dir = Path(output_dir) if output_dir else default_output_dir()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    output_path = out_dir / report_filename(class_name)
+
+    # Errors propagate: the atomic save has already removed the partial file
+    with current_metrics().stage("save"):
+        result = save_atomic(output_path, lambda f: write_docx(doc, f, compression))
+    current_metrics().count("bytes_written", result.bytes_written)
+    return result
+
+def save_pdf_report(
     settings,
     student_language_pairs: List[Tuple[Student, str]],
+    attendance_data: Optional[Dict[str, AttendanceData]] = None,
+    on_progress: ProgressFn = None,
     output_dir: Optional[str] = None,
+) -> SaveResult:
+    """Stream the letters straight into a PDF file (no Word needed for printing)."""
+    from .pdf_report import render_report_pdf
+
+    out_dir = Path(output_dir) if output_dir else default_output_dir()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    output_path = out_dir / report_filename(settings.class_name, "pdf")
+
+    # render_report_pdf records its own bytes_written
+    return save_atomic(output_path, lambda f: render_report_pdf(
+        settings, student_language_pairs, f, attendance_data, on_progress))
+
+def build_report(
+    settings,
+    student_language_pairs: List[Tuple[Student, str]],
+    attendance_data: Optional[Dict[str, AttendanceData]] = None,
     on_progress: ProgressFn = None,
-    attendance_path: str = ""
-) -> str:
+    summary=None,
+) -> Document:
+    """Build the letters document in memory from already-parsed inputs.
+
+    ``summary`` (an analytics.ClassSummary) adds a class cover sheet first.
+    """
     progress(on_progress, 0)
     language_grouped_students = defaultdict(list)
     for student, language in student_language_pairs:
         language_grouped_students[language].append(student)
 
-    attendance_data = parse_attendance_data(attendance_path)
-    doc = setup_document(settings, output_dir)
+    attendance_data = attendance_data or {}
+    with current_metrics().stage("build_document"):
+        doc = setup_document(settings)
+        if summary is not None:
+            add_summary_section(doc, summary, settings.class_name)
 
-    total = sum(len(v) for v in language_grouped_students.values()) or 1
-    done = 0
+        total = sum(len(v) for v in language_grouped_students.values()) or 1
+        done = 0
 
-    languages = list(language_grouped_students.keys())
-    for idx, (language, students) in enumerate(language_grouped_students.items()):
-        empty = (idx == len(languages) - 1)
-        doc = generate_report_for_language(doc, students, settings, language, on_progress, empty, attendance_data)
-        done += len(students)
-        progress(on_progress, int(100 * done / total))
+        languages = list(language_grouped_students.keys())
+        for idx, (language, students) in enumerate(language_grouped_students.items()):
+            empty = (idx == len(languages) - 1)
+            language_progress = scaled(on_progress, 100 * done / total, 100 * (done + len(students)) / total)
+            doc = generate_report_for_language(doc, students, settings, language, language_progress, empty, attendance_data)
+            done += len(students)
+            progress(on_progress, int(100 * done / total))
 
-    return save_document(doc, settings.class_name)
+    return doc
+
+def render_report(
+    settings,
+    student_language_pairs: List[Tuple[Student, str]],
+    attendance_data: Optional[Dict[str, AttendanceData]] = None,
+    on_progress: ProgressFn = None,
+    stream: Optional[BinaryIO] = None,
+    summary=None,
+    compression: str = "default",
+) -> Optional[bytes]:
+    """Render the report as .docx without touching the filesystem.
+
+    Writes into ``stream`` when one is given (and returns None); otherwise
+    returns the document as bytes.
+    """
+    doc = build_report(settings, student_language_pairs, attendance_data, on_progress, summary)
+    metrics = current_metrics()
+    if stream is not None:
+        # The caller's stream need not start at 0; count only what this write added
+        start = stream.tell() if metrics.enabled and hasattr(stream, "tell") else None
+        with metrics.stage("save"):
+            write_docx(doc, stream, compression)
+        if start is not None:
+            metrics.count("bytes_written", stream.tell() - start)
+        return None
+    buf = io.BytesIO()
+    with metrics.stage("save"):
+        write_docx(doc, buf, compression)
+    metrics.count("bytes_written", buf.tell())
+    return buf.getvalue()
+
+def generate_report_for_selected(
+    settings,
+    student_language_pairs: List[Tuple[Student, str]],
+    output_dir: Optional[str] = None,
+    on_progress: ProgressFn = None,
+    attendance_path: str = "",
+    include_summary: bool = False,
+    chronic_absence_threshold: float = 10.0,
+    output_format: str = "docx",
+    compression: Optional[str] = None,
+) -> SaveResult:
+    if include_summary and output_format == "pdf":
+        raise ValueError("The class summary cover sheet is only available for docx reports")
+    if compression is not None and output_format == "pdf":
+        raise ValueError("Compression levels only apply to docx reports")
+    attendance_data = parse_attendance_data(attendance_path)
+    if output_format == "pdf":
+        return save_pdf_report(settings, student_language_pairs, attendance_data, on_progress, output_dir)
+    summary = None
+    if include_summary:
+        from .analytics import summarize_class  # numpy is only needed for the cover sheet
+        with current_metrics().stage("class_summary"):
+            summary = summarize_class([s for s, _ in student_language_pairs], attendance_data,
+                                      chronic_absence_threshold)
+    doc = build_report(settings, student_language_pairs, attendance_data, on_progress, summary)
+    return save_document(doc, settings.class_name, output_dir, compression or "default")
@@ -0,0 +1,69 @@
+import csv
+import os
+import tempfile
+from contextlib import contextmanager
+
+from .mapped_csv import BareCrLineEndings, read_students
+from .metrics import current_metrics
+from .student import Student
+
+
+@contextmanager
+def _csv_source(input_file: str):
+    """Yield a CSV path for ``input_file``, converting xlsx exports to a temp file."""
+    if not input_file:
+        raise ValueError("input_file is required")
+
+    if not input_file.lower().endswith(".xlsx"):
+        yield input_file
+        return
+
+    # Only pay for xlsx2csv when an xlsx export is actually opened
+    from xlsx2csv import Xlsx2csv
+
+    fd, temp_csv_path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        with current_metrics().stage("xlsx_convert"):
+            Xlsx2csv(input_file).convert(temp_csv_path)
+        yield temp_csv_path
+    finally:
+        if os.path.exists(temp_csv_path):
+            try:
+                os.remove(temp_csv_path)
+            except OSError:
+                pass
+
+
+def _read_records(source: str):
+    data = []
+    with open(source, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        headers = next(reader)
+        for row in reader:
+            record = {headers[i]: row[i] for i in range(min(len(headers), len(row)))}
+            data.append(record)
+    return data
+
+def open_file(input_file: str):
+    metrics = current_metrics()
+    with _csv_source(input_file) as source:
+        with metrics.stage("read_scoresheet"):
+            data = _read_records(source)
+    metrics.count("rows_parsed", len(data))
+    return data
+
+def parse_students(input_file: str, settings):
+    # The mapped reader decodes only the cells a Student needs, so the
+    # per-row dicts that open_file builds are skipped entirely here.
+    metrics = current_metrics()
+    with _csv_source(input_file) as source:
+        with metrics.stage("parse_students"):
+            try:
+                students = read_students(source, settings.class_name, settings.custom_message)
+            except BareCrLineEndings:
+                # Old Mac-style exports; the csv module splits these correctly
+                students = [Student(entry, settings.class_name, settings.custom_message)
+                            for entry in _read_records(source)]
+    metrics.count("rows_parsed", len(students))
+    return students
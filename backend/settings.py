@@ -12,6 +12,14 @@ def _user_config_path(filename: str = "user.settings.json") -> Path:
     base.mkdir(parents=True, exist_ok=True)
     return base / filename
 
+def _externalize_logo(data_url: str, directory: Path) -> str:
+    try:
+        from .logo import decode_logo_dataurl, store_logo
+    except ImportError:
+        from logo import decode_logo_dataurl, store_logo
+    asset = decode_logo_dataurl(data_url)
+    return store_logo(asset, str(directory)) if asset else ""
+
 @dataclass
 class Settings:
     teacher_name: str = ""
@@ -24,6 +32,7 @@ class Settings:
     school_name: str = ""
     school_address: str = ""
     school_logo_dataurl: Optional[str] = None
+    school_logo_asset: Optional[str] = None
 
     def to_dict(self) -> dict:
         return asdict(self)
@@ -41,12 +50,20 @@ class Settings:
             school_name=data.get("school_name", ""),
             school_address=data.get("school_address", ""),
             school_logo_dataurl=data.get("school_logo_dataurl"),
+            school_logo_asset=data.get("school_logo_asset"),
         )
 
     def save_to_file(self, filepath: Optional[str | os.PathLike] = None) -> Path:
         path = Path(filepath) if filepath else _user_config_path()
+        data = self.to_dict()
+        if self.school_logo_dataurl:
+            # Keep the settings file small: the logo lives in a content-hashed asset
+            asset_path = _externalize_logo(self.school_logo_dataurl, path.parent / "user_assets")
+            if asset_path:
+                data["school_logo_dataurl"] = None
+                data["school_logo_asset"] = asset_path
         with path.open("w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            json.dump(data, f, indent=2, ensure_ascii=False)
         return path
 
     @classmethod
@@ -0,0 +1,158 @@
+# backend/snapshot.py
+from __future__ import annotations
+import multiprocessing
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, fields, replace
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, Optional, Tuple
+
+from .letter import LetterTemplates, LetterWriter
+from .logo import LogoAsset, load_logo
+from .metrics import current_metrics
+from .settings import Settings
+
+
+@dataclass(frozen=True)
+class RunSnapshot:
+    """Everything a worker needs that does not change during a run.
+
+    Built once in the parent: settings, the decoded logo, one set of
+    translated letter templates per language and the scoresheet header row.
+    Workers read it through ``current_snapshot()`` instead of reloading
+    settings, decoding the logo and translating the templates themselves.
+    """
+    settings_items: Tuple[Tuple[str, object], ...]
+    logo: Optional[LogoAsset]
+    templates: Tuple[LetterTemplates, ...]
+    headers: Tuple[str, ...] = ()
+
+    @property
+    def settings(self) -> Settings:
+        # A fresh copy each time, so callers cannot change the shared one
+        return Settings(**dict(self.settings_items))
+
+    @property
+    def languages(self) -> Tuple[str, ...]:
+        return tuple(t.language for t in self.templates)
+
+    def letter_templates(self, language: str, with_attendance: bool) -> LetterTemplates:
+        for t in self.templates:
+            if t.language == language and t.with_attendance == with_attendance:
+                return t
+        raise KeyError(f"no letter templates for {language!r} (attendance={with_attendance})")
+
+    def letter_writer(self, language: str, attendance_data: dict) -> LetterWriter:
+        settings = dict(self.settings_items)
+        templates = self.letter_templates(language, len(attendance_data) > 0)
+        return LetterWriter.from_templates(templates, settings["teacher_name"], settings["teacher_email"],
+                                           attendance_data)
+
+
+def build_snapshot(settings: Settings, languages: Iterable[str], with_attendance: bool = False,
+                   headers: Iterable[str] = ()) -> RunSnapshot:
+    """Freeze ``settings`` and translate the letter templates for ``languages`` once."""
+    with current_metrics().stage("build_snapshot"):
+        logo = load_logo(settings)
+        # The logo travels as bytes; don't ship the base64 copy as well
+        frozen = replace(settings, school_logo_dataurl=None) if logo is not None else settings
+        items = tuple((f.name, getattr(frozen, f.name)) for f in fields(Settings))
+
+        templates = tuple(
+            LetterWriter(settings.teacher_name, settings.teacher_email, language,
+                         settings.custom_message, {}, with_attendance=with_attendance).templates
+            for language in dict.fromkeys(languages)
+        )
+        return RunSnapshot(items, logo, templates, tuple(headers))
+
+
+_current: Optional[RunSnapshot] = None
+
+
+def current_snapshot() -> RunSnapshot:
+    if _current is None:
+        raise RuntimeError("no run snapshot is installed in this process")
+    return _current
+
+
+def set_snapshot(snapshot: Optional[RunSnapshot]) -> Optional[RunSnapshot]:
+    """Install ``snapshot`` for this process; returns the previous one."""
+    global _current
+    previous = _current
+    _current = snapshot
+    return previous
+
+
+class SharedSnapshot:
+    """A snapshot pickled once into a named shared-memory block.
+
+    Only ``handle`` (name and size) crosses the process boundary; each worker
+    unpickles the block once in its initializer via ``attach``. The creating
+    process owns the block and unlinks it on ``close()``.
+    """
+
+    def __init__(self, snapshot: RunSnapshot):
+        payload = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, len(payload)))
+        self._shm.buf[:len(payload)] = payload
+        self.handle: Tuple[str, int] = (self._shm.name, len(payload))
+        current_metrics().count("snapshot_bytes", len(payload))
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> "SharedSnapshot":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(name: str, size: int) -> RunSnapshot:
+    """Load a published snapshot and install it for this process (pool initializer)."""
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf[:size]
+    try:
+        snapshot = pickle.loads(view)
+    finally:
+        view.release()
+        shm.close()
+    set_snapshot(snapshot)
+    return snapshot
+
+
+def _can_fork() -> bool:
+    # macOS lists fork but system frameworks are not fork-safe there
+    return "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin"
+
+
+@contextmanager
+def worker_pool(snapshot: RunSnapshot, max_workers: Optional[int] = None,
+                share: str = "auto") -> Iterator[ProcessPoolExecutor]:
+    """Process pool whose workers see ``snapshot`` through ``current_snapshot()``.
+
+    ``share="fork"`` installs the snapshot before the workers are forked so
+    they inherit it without any copy; ``"shm"`` publishes it to shared memory
+    (the only option under spawn, e.g. on Windows). ``"auto"`` forks where
+    that is safe. Either way tasks never carry the snapshot themselves.
+    """
+    if share == "auto":
+        share = "fork" if _can_fork() else "shm"
+    if share == "fork":
+        previous = set_snapshot(snapshot)
+        try:
+            with ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("fork")) as pool:
+                yield pool
+        finally:
+            set_snapshot(previous)
+    elif share == "shm":
+        with SharedSnapshot(snapshot) as shared, \
+                ProcessPoolExecutor(max_workers, initializer=attach, initargs=shared.handle) as pool:
+            yield pool
+    else:
+        raise ValueError(f"unknown share mode {share!r}; expected 'auto', 'fork' or 'shm'")
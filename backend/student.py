@@ -1,19 +1,29 @@
 from .util import normalize_name
 class Student:
     def __init__(self, entry, subject, message):
-        first_column = list(entry.keys())[0]
-        self.name = normalize_name(entry[first_column])
-        self.display_name = ' '.join(reversed(entry[first_column].split(', ')))
+        keys = list(entry.keys())
+        first_column, grade_column = keys[0], keys[1]
+        missing = [header for header in keys
+                   if header != first_column and header != grade_column
+                   and entry[header] in ("0", "0.0")]
+        self._populate(entry[first_column], entry[grade_column], missing, subject, message)
+
+    @classmethod
+    def from_values(cls, raw_name, grade_cell, missing_assignments, subject, message):
+        """Build a student from already-extracted cells (see mapped_csv.read_students)."""
+        student = cls.__new__(cls)
+        student._populate(raw_name, grade_cell, list(missing_assignments), subject, message)
+        return student
+
+    def _populate(self, raw_name, grade_cell, missing_assignments, subject, message):
+        self.name = normalize_name(raw_name)
+        self.display_name = ' '.join(reversed(raw_name.split(', ')))
         self.first_name = self.name.split(' ')[0]
-        self.grade = entry[list(entry.keys())[1]].split(" ")[0]
-        self.percent = entry[list(entry.keys())[1]].split(" ")[1]
+        self.grade = grade_cell.split(" ")[0]
+        self.percent = grade_cell.split(" ")[1]
         self.subject = subject
         self.message = message
-        self.missing_assignments = []
-        for header in entry.keys():
-            if header != first_column and header != list(entry.keys())[1]:
-                if entry[header] and (entry[header] == "0" or entry[header] == "0.0"):
-                    self.missing_assignments.append(header)
+        self.missing_assignments = missing_assignments
 
     def getGrade(self):
         return float(self.percent.strip('%'))
@@ -3,7 +3,8 @@ from __future__ import annotations
 import logging
 from functools import lru_cache
 from typing import Optional
-import requests
+
+from .metrics import current_metrics
 
 log = logging.getLogger(__name__)
 
@@ -12,10 +13,13 @@ HEADERS = {"User-Agent": "WIHS-ReportGenerator/1.0"}
 
 @lru_cache(maxsize=2048)
 def _cached_translate(text: str, target_language: str) -> str:
+    import requests  # deferred: English-only runs never touch the network stack
+
     params = {"q": text, "langpair": f"en|{target_language}"}
-    resp = requests.get(MYMEMORY_URL, params=params, headers=HEADERS, timeout=15)
-    resp.raise_for_status()
-    data = resp.json()
+    with current_metrics().stage("translate_request"):
+        resp = requests.get(MYMEMORY_URL, params=params, headers=HEADERS, timeout=15)
+        resp.raise_for_status()
+        data = resp.json()
     return data.get("responseData", {}).get("translatedText", text)
 
 def translate(text: str, target_language: str = "es", *, fallback: Optional[str] = None) -> str:
@@ -25,7 +29,16 @@ def translate(text: str, target_language: str = "es", *, fallback: Optional[str]
             return text
         if target_language == "en":
             return text
-        return _cached_translate(s, target_language)
+        metrics = current_metrics()
+        if not metrics.enabled:
+            return _cached_translate(s, target_language)
+        misses = _cached_translate.cache_info().misses
+        result = _cached_translate(s, target_language)
+        # A failed request is counted once, as a translation_error, below
+        hit = _cached_translate.cache_info().misses == misses
+        metrics.count("translation_cache_hits" if hit else "translation_cache_misses")
+        return result
     except Exception as e:
+        current_metrics().count("translation_errors")
         log.debug("Translation error: %s", e)
         return fallback if fallback is not None else text
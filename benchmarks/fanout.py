@@ -0,0 +1,103 @@
+"""Worker fan-out cost: shipping the run configuration per task vs. a shared snapshot.
+
+Each task writes the letters for one chunk of students. The ``per-task``
+mode pickles the snapshot (settings, decoded logo, translated templates)
+into every task, as a naive pool would; ``fork`` and ``shm`` share one
+``RunSnapshot`` through ``backend.snapshot.worker_pool``:
+
+    python -m benchmarks.fanout --students 2000 --workers 1,2,4,8
+"""
+from __future__ import annotations
+import argparse, base64, json, os, pickle, random, sys, tempfile, time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.pipeline import local_translation_endpoint
+from benchmarks.synthetic import scoresheet_rows, write_scoresheet_csv
+
+
+def _write_chunk(snapshot, language: str, students: list) -> int:
+    writer = snapshot.letter_writer(language, {})
+    return sum(len(writer.generate_letter(s)) for s in students)
+
+
+def letters_per_task(snapshot, language: str, students: list) -> int:
+    return _write_chunk(snapshot, language, students)
+
+
+def letters_shared(language: str, students: list) -> int:
+    from backend.snapshot import current_snapshot
+
+    return _write_chunk(current_snapshot(), language, students)
+
+
+def run_mode(mode: str, snapshot, chunks: List[tuple], workers: int) -> Dict[str, float]:
+    from backend.snapshot import worker_pool
+
+    start = time.perf_counter()
+    if mode == "per-task":
+        with ProcessPoolExecutor(workers) as pool:
+            total = sum(pool.map(letters_per_task, [snapshot] * len(chunks), *zip(*chunks)))
+        task_bytes = len(pickle.dumps((snapshot,) + chunks[0]))
+    else:
+        with worker_pool(snapshot, workers, share=mode) as pool:
+            total = sum(pool.map(letters_shared, *zip(*chunks)))
+        task_bytes = len(pickle.dumps(chunks[0]))
+    return {"seconds": round(time.perf_counter() - start, 4), "task_bytes": task_bytes, "chars": total}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--chunk", type=int, default=25, help="students per task")
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--logo-kib", type=int, default=512, help="size of the synthetic logo")
+    parser.add_argument("--modes", default="per-task,fork,shm")
+    parser.add_argument("--output", help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    from backend.mapped_csv import read_students
+    from backend.settings import Settings
+    from backend.snapshot import build_snapshot
+
+    rng = random.Random(0)
+    logo = b"\x89PNG\r\n\x1a\n" + bytes(rng.getrandbits(8) for _ in range(args.logo_kib * 1024))
+    settings = Settings(
+        teacher_name="Teacher Bench", teacher_email="teacher@example.org", class_name="Benchmark 101",
+        custom_message="Missing work can still be turned in.", school_name="Synthetic High School",
+        school_logo_dataurl="data:image/png;base64," + base64.b64encode(logo).decode("ascii"),
+    )
+    languages = ["en", "es", "ar"]
+    with tempfile.TemporaryDirectory(prefix="fanout-") as workdir:
+        headers, rows = scoresheet_rows(args.students, 30)
+        path = write_scoresheet_csv(os.path.join(workdir, "scoresheet.csv"), headers, rows)
+        students = read_students(path, settings.class_name, settings.custom_message)
+        with local_translation_endpoint():
+            snapshot = build_snapshot(settings, languages, headers=headers)
+
+    chunks = [(languages[i // args.chunk % len(languages)], students[i:i + args.chunk])
+              for i in range(0, len(students), args.chunk)]
+    results = {"params": vars(args) | {"tasks": len(chunks), "snapshot_bytes": len(pickle.dumps(snapshot))},
+               "runs": []}
+    for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            results["runs"].append({"mode": mode, "workers": workers, **run_mode(mode, snapshot, chunks, workers)})
+
+    if len({r["chars"] for r in results["runs"]}) > 1:
+        print("FAIL modes produced different letters", file=sys.stderr)
+        return 1
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    print(f"{'mode':<10}{'workers':>8}{'seconds':>10}{'bytes/task':>12}")
+    for r in results["runs"]:
+        print(f"{r['mode']:<10}{r['workers']:>8}{r['seconds']:>10.3f}{r['task_bytes']:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""End-to-end timing of the report pipeline on synthetic data.
+
+Each stage is timed separately over several repeats:
+
+    open_file -> parse_students -> parse_attendance_data -> LetterWriter
+    -> document build -> save
+
+Translation requests go to a local stand-in for the MyMemory endpoint so the
+numbers do not depend on the network. Results are written as JSON and can be
+compared against a previous run:
+
+    python -m benchmarks.pipeline --students 1000 --output bench.json
+    python -m benchmarks.pipeline --students 1000 --compare bench.json
+"""
+from __future__ import annotations
+import argparse, datetime, json, os, platform, statistics, subprocess, sys, tempfile, threading, time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from backend.output import COMPRESSION_LEVELS
+from benchmarks.synthetic import generate_dataset
+
+STAGES = ["open_file", "parse_students", "parse_attendance_data", "letter_writer", "document_build", "save"]
+
+
+class _TranslationHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        text = query.get("q", [""])[0]
+        target = query.get("langpair", ["en|xx"])[0].split("|")[-1]
+        if self.latency:
+            time.sleep(self.latency)
+        body = json.dumps({"responseData": {"translatedText": f"[{target}] {text}"}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def local_translation_endpoint(latency: float = 0.0):
+    """Serve MyMemory-shaped responses on localhost and point backend.translate at it."""
+    from backend import translate
+
+    handler = type("Handler", (_TranslationHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    original = translate.MYMEMORY_URL
+    translate.MYMEMORY_URL = f"http://127.0.0.1:{server.server_address[1]}/get"
+    try:
+        yield translate.MYMEMORY_URL
+    finally:
+        translate.MYMEMORY_URL = original
+        server.shutdown()
+        server.server_close()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _timed(fn: Callable):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run_once(paths: dict, scoresheet: str, languages: List[str], workdir: str, cold_translation: bool,
+             compression: str = "default") -> Dict[str, float]:
+    from backend import translate
+    from backend.letter import LetterWriter
+    from backend.report_generator import build_report, open_file, parse_attendance_data, parse_students, save_document
+    from backend.settings import Settings
+
+    if cold_translation:
+        translate._cached_translate.cache_clear()
+
+    settings = Settings(
+        teacher_name="Teacher Bench", teacher_email="teacher@example.org", class_name="Benchmark 101",
+        custom_message="Missing work can still be turned in.", school_name="Synthetic High School",
+        school_address="1 Benchmark Way",
+    )
+    timings: Dict[str, float] = {}
+
+    _, timings["open_file"] = _timed(lambda: open_file(paths[scoresheet]))
+    students, timings["parse_students"] = _timed(lambda: parse_students(paths[scoresheet], settings))
+    attendance, timings["parse_attendance_data"] = _timed(lambda: parse_attendance_data(paths.get("pdf", "")))
+
+    pairs = [(s, languages[i % len(languages)]) for i, s in enumerate(students)]
+
+    def write_letters():
+        for language in languages:
+            writer = LetterWriter(settings.teacher_name, settings.teacher_email, language,
+                                  settings.custom_message, attendance)
+            for student, lang in pairs:
+                if lang == language:
+                    writer.generate_letter(student)
+
+    _, timings["letter_writer"] = _timed(write_letters)
+    doc, timings["document_build"] = _timed(lambda: build_report(settings, pairs, attendance))
+    # The production save path: atomic temp-file write at the chosen compression
+    _, timings["save"] = _timed(lambda: save_document(doc, settings.class_name, workdir, compression))
+    return timings
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, dict]:
+    return {
+        stage: {
+            "median_s": round(statistics.median(r[stage] for r in runs), 6),
+            "min_s": round(min(r[stage] for r in runs), 6),
+            "runs_s": [round(r[stage], 6) for r in runs],
+        }
+        for stage in STAGES
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Print per-stage ratios against a baseline; return stages slower than threshold."""
+    regressions = []
+    print(f"{'stage':<24}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for stage in STAGES:
+        old = baseline.get("stages", {}).get(stage, {}).get("median_s")
+        new = current["stages"][stage]["median_s"]
+        if not old:
+            print(f"{stage:<24}{'-':>12}{new:>12.4f}{'-':>8}")
+            continue
+        ratio = new / old
+        print(f"{stage:<24}{old:>12.4f}{new:>12.4f}{ratio:>8.2f}")
+        if ratio > threshold:
+            regressions.append(stage)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--assignments", type=int, default=30)
+    parser.add_argument("--days", type=int, default=40)
+    parser.add_argument("--scoresheet", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--languages", default="en,es,ar", help="comma separated, assigned round-robin")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--translation-latency", type=float, default=0.0, help="seconds added per stand-in request")
+    parser.add_argument("--warm-translation", action="store_true", help="keep the translation cache between repeats")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compression", choices=COMPRESSION_LEVELS, default="default",
+                        help="docx zip compression for the save stage")
+    parser.add_argument("--output", help="write JSON results here")
+    parser.add_argument("--compare", help="baseline JSON from a previous run")
+    parser.add_argument("--threshold", type=float, default=1.25, help="ratio above which --compare fails")
+    args = parser.parse_args(argv)
+
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    with tempfile.TemporaryDirectory(prefix="report-bench-") as workdir:
+        paths = generate_dataset(workdir, args.students, args.assignments, args.days,
+                                 seed=args.seed, formats=[args.scoresheet, "pdf"])
+        with local_translation_endpoint(args.translation_latency):
+            runs = [run_once(paths, args.scoresheet, languages, workdir, not args.warm_translation, args.compression)
+                    for _ in range(max(1, args.repeat))]
+
+    result = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "threshold")},
+        },
+        "stages": summarize(runs),
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        if regressions:
+            print(f"FAIL slower than {args.threshold}x: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    elif not args.output:
+        print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
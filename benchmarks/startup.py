@@ -0,0 +1,88 @@
+"""Cold-start import budget for the backend CLI.
+
+Runs ``python -X importtime`` in a fresh interpreter for each subcommand's
+entry point and fails (exit code 1) when the cumulative import time exceeds
+its budget, or when a fast path pulls in a heavy dependency it should not.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 9 --scale 1.5
+"""
+from __future__ import annotations
+import argparse, json, os, re, statistics, subprocess, sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("docx", "lxml", "xlsx2csv", "PyPDF2", "requests")
+
+# (name, statement, budget in ms, modules that must not be imported)
+TARGETS: List[Tuple[str, str, float, Tuple[str, ...]]] = [
+    ("list-students", "import backend.cli", 60.0, HEAVY_MODULES),
+    ("generate-selected", "import backend.cli, backend.report_generator", 250.0, ("PyPDF2", "requests", "xlsx2csv")),
+]
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(statement: str) -> Tuple[float, Dict[str, int]]:
+    """Return (total ms, {top-level module: cumulative us}) for one cold import."""
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT, "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    modules: Dict[str, int] = {}
+    total_us = 0
+    started = False
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        # Everything before the first backend import is interpreter/site startup
+        started = started or name.split(".")[0] == "backend"
+        if not started:
+            continue
+        modules[name] = cumulative
+        if indent == 1:  # only count top-level imports once
+            total_us += cumulative
+    return total_us / 1000.0, modules
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="cold imports per target; the median is compared")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget (slow CI machines)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    failures: List[str] = []
+    results = []
+    for name, statement, budget, forbidden in TARGETS:
+        timings = []
+        loaded: Dict[str, int] = {}
+        for _ in range(max(1, args.runs)):
+            ms, loaded = measure(statement)
+            timings.append(ms)
+        median = statistics.median(timings)
+        limit = budget * args.scale
+        leaked = sorted(m for m in forbidden if m in loaded)
+
+        results.append({"target": name, "median_ms": round(median, 2), "budget_ms": limit, "forbidden_imports": leaked})
+        if median > limit:
+            failures.append(f"{name}: {median:.1f} ms exceeds budget of {limit:.1f} ms")
+        if leaked:
+            failures.append(f"{name}: imports {', '.join(leaked)}")
+
+    if args.json:
+        print(json.dumps({"results": results, "failures": failures}, indent=2))
+    else:
+        for r in results:
+            print(f"{r['target']:<20} {r['median_ms']:>8.1f} ms  (budget {r['budget_ms']:.0f} ms)")
+        for f in failures:
+            print(f"FAIL {f}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
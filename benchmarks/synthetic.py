@@ -0,0 +1,252 @@
+"""Synthetic PowerTeacherPro scoresheets and Class Attendance Audit reports.
+
+Everything is generated from a seeded RNG so runs are reproducible and no
+real student data is needed:
+
+    python -m benchmarks.synthetic --students 500 --assignments 40 --out /tmp/synth
+"""
+from __future__ import annotations
+import argparse, csv, io, os, random, zipfile
+from typing import List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+FIRST_NAMES = [
+    "Ana", "Omar", "Lucia", "Yusuf", "Maria", "Ali", "Sofia", "Hassan", "Diego", "Layla",
+    "Carlos", "Noor", "Elena", "Karim", "Isabel", "Zaid", "Camila", "Samir", "Valeria", "Rami",
+]
+LAST_NAMES = [
+    "Garcia", "Hernandez", "Haddad", "Lopez", "Saleh", "Martinez", "Nasser", "Rodriguez",
+    "Khalil", "Gonzalez", "Mansour", "Perez", "Aziz", "Sanchez", "Farah", "Ramirez",
+]
+LETTER_GRADES = [(90, "A"), (80, "B"), (70, "C"), (60, "D"), (0, "E")]
+
+# Weighted towards "P" like a real audit; every code is in attendance.VALID_CODES
+ATTENDANCE_CODES = ["P"] * 14 + ["T", "T", "A", "A", "EA", "PFD", "M", "K"]
+
+
+def student_names(n: int, rng: random.Random) -> List[str]:
+    """Unique "Last, First" names (a numeric suffix keeps large rosters unique)."""
+    names, seen = [], set()
+    while len(names) < n:
+        last, first = rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES)
+        if (last, first) in seen:
+            first = f"{first}{chr(97 + len(names) % 26)}"
+            last = f"{last}{'x' * (len(names) // 26 % 5)}"
+        if (last, first) in seen:
+            continue
+        seen.add((last, first))
+        names.append(f"{last}, {first}")
+    return names
+
+
+def scoresheet_rows(
+    students: int, assignments: int, missing_rate: float = 0.1, seed: int = 0
+) -> Tuple[List[str], List[List[str]]]:
+    """Headers and rows shaped like a PowerTeacherPro scoresheet export."""
+    rng = random.Random(seed)
+    headers = ["Student", "Final Grade"] + [f"Assignment {i + 1}" for i in range(assignments)]
+    rows = []
+    for name in student_names(students, rng):
+        percent = rng.randint(35, 100)
+        letter = next(g for cutoff, g in LETTER_GRADES if percent >= cutoff)
+        cells = []
+        for _ in range(assignments):
+            r = rng.random()
+            if r < missing_rate:
+                cells.append(rng.choice(["0", "0.0"]))
+            elif r < missing_rate + 0.05:
+                cells.append("")
+            else:
+                cells.append(str(rng.randint(5, 10)))
+        rows.append([name, f"{letter} {percent}%"] + cells)
+    return headers, rows
+
+
+def write_scoresheet_csv(path: str, headers: List[str], rows: List[List[str]]) -> str:
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows(rows)
+    return path
+
+
+def _column_name(index: int) -> str:
+    name = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        name = chr(65 + rem) + name
+    return name
+
+
+def write_scoresheet_xlsx(path: str, headers: List[str], rows: List[List[str]]) -> str:
+    """Minimal single-sheet workbook using inline strings (no extra dependency)."""
+    sheet = io.StringIO()
+    sheet.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+    for r, values in enumerate([headers] + rows, start=1):
+        sheet.write(f'<row r="{r}">')
+        for c, value in enumerate(values):
+            if value == "":
+                continue
+            ref = f"{_column_name(c)}{r}"
+            if r > 1 and c > 1:
+                sheet.write(f'<c r="{ref}"><v>{value}</v></c>')
+            else:
+                sheet.write(f'<c r="{ref}" t="inlineStr"><is><t>{escape(value)}</t></is></c>')
+        sheet.write("</row>")
+    sheet.write("</sheetData></worksheet>")
+
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '</Types>'
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        "xl/workbook.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Scoresheet" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+            '</Relationships>'
+        ),
+        "xl/worksheets/sheet1.xml": sheet.getvalue(),
+    }
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, xml in parts.items():
+            zf.writestr(name, xml)
+    return path
+
+
+def attendance_lines(names: List[str], days: int = 40, seed: int = 0) -> List[str]:
+    """Text lines in the layout parse_text_to_map expects from a Class Attendance Audit."""
+    rng = random.Random(seed)
+    lines = [
+        "Class Attendance Audit",
+        "Teacher: Synthetic, Teacher",
+        "Course: Benchmark 101",
+        "Section: 1",
+    ]
+    for i, name in enumerate(names, start=1):
+        codes = [rng.choice(ATTENDANCE_CODES) for _ in range(days)]
+        attended = sum(c in ("P", "T", "PFD") for c in codes)
+        lines.append(f"{i}. {name} {rng.randint(9, 12)} {days} {attended} MF {' '.join(codes)}")
+    lines.append(f"Total Membership: {len(names) * days}")
+    return lines
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_attendance_pdf(path: str, lines: List[str], lines_per_page: int = 45) -> str:
+    """Plain text PDF (Helvetica, one text object per line) that PyPDF2 can extract."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for number, page_lines in enumerate(pages, start=1):
+        ops = ["BT /F1 8 Tf 10 TL 36 760 Td"]
+        for line in page_lines + [f"Page {number} of {len(pages)}"]:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        content = "\n".join(ops).encode("latin-1", "replace")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % p for p in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    with open(path, "wb") as f:
+        f.write(out.getvalue())
+    return path
+
+
+def generate_dataset(
+    out_dir: str,
+    students: int,
+    assignments: int,
+    days: int = 40,
+    missing_rate: float = 0.1,
+    seed: int = 0,
+    formats: Optional[List[str]] = None,
+) -> dict:
+    """Write a scoresheet (csv/xlsx) plus attendance text/pdf; return their paths."""
+    formats = formats or ["csv", "xlsx", "txt", "pdf"]
+    os.makedirs(out_dir, exist_ok=True)
+    headers, rows = scoresheet_rows(students, assignments, missing_rate, seed)
+    lines = attendance_lines([r[0] for r in rows], days, seed)
+    stem = f"synthetic_{students}x{assignments}"
+
+    paths = {}
+    if "csv" in formats:
+        paths["csv"] = write_scoresheet_csv(os.path.join(out_dir, f"{stem}.csv"), headers, rows)
+    if "xlsx" in formats:
+        paths["xlsx"] = write_scoresheet_xlsx(os.path.join(out_dir, f"{stem}.xlsx"), headers, rows)
+    if "txt" in formats:
+        paths["txt"] = os.path.join(out_dir, f"{stem}_attendance.txt")
+        with open(paths["txt"], "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    if "pdf" in formats:
+        paths["pdf"] = write_attendance_pdf(os.path.join(out_dir, f"{stem}_attendance.pdf"), lines)
+    return paths
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--assignments", type=int, default=30)
+    parser.add_argument("--days", type=int, default=40, help="attendance codes per student")
+    parser.add_argument("--missing-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--formats", default="csv,xlsx,txt,pdf")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+
+    paths = generate_dataset(
+        args.out, args.students, args.assignments, args.days,
+        args.missing_rate, args.seed, args.formats.split(","),
+    )
+    for kind, path in paths.items():
+        print(f"{kind:<5} {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,6 +16,15 @@ a = Analysis(
     ],
     hiddenimports=[
         'backend.report_generator',
+        'backend.scoresheet',
+        'backend.metrics',
+        'backend.profiling',
+        'backend.progress',
+        'backend.analytics',
+        'backend.pdf_report',
+        'backend.mapped_csv',
+        'backend.snapshot',
+        'backend.output',
         'backend.settings',
         'backend.student',
         'backend.letter',
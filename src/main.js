@@ -2,6 +2,7 @@ const { app, BrowserWindow, ipcMain, dialog, shell } = require('electron');
 const path = require('path');
 const { spawn, spawnSync } = require('child_process');
 const fs = require('fs');
+const crypto = require('crypto');
 const { autoUpdater } = require('electron-updater');
 
 let win;
@@ -358,6 +359,49 @@ function settingsPath() {
   return path.join(app.getPath('userData'), 'user.settings.json');
 }
 
+const LOGO_EXTENSIONS = { jpeg: 'jpg', 'svg+xml': 'svg' };
+const LOGO_MIME_TYPES = { jpg: 'image/jpeg', svg: 'image/svg+xml' };
+
+// Move an embedded logo data URL into a content-hashed file under userData and
+// reference it by path, so the backend never parses or decodes the base64 blob.
+// Naming matches backend/logo.py (logo-<sha256[:16]>.<ext>).
+function externalizeLogo(settingsObj) {
+  const dataUrl = settingsObj && settingsObj.school_logo_dataurl;
+  const m = typeof dataUrl === 'string' && dataUrl.match(/^data:image\/([\w.+-]+);base64,(.*)$/s);
+  if (!m) return settingsObj;
+  try {
+    const buf = Buffer.from(m[2], 'base64');
+    const digest = crypto.createHash('sha256').update(buf).digest('hex');
+    const subtype = m[1].toLowerCase();
+    const ext = LOGO_EXTENSIONS[subtype] || subtype;
+    const dir = path.join(app.getPath('userData'), 'user_assets');
+    const file = path.join(dir, `logo-${digest.slice(0, 16)}.${ext}`);
+    if (!fs.existsSync(file)) {
+      fs.mkdirSync(dir, { recursive: true });
+      fs.writeFileSync(file, buf);
+    }
+    return { ...settingsObj, school_logo_dataurl: null, school_logo_asset: file };
+  } catch (e) {
+    console.warn('[main] could not externalize logo:', e);
+    return settingsObj;
+  }
+}
+
+// Inverse of externalizeLogo for the renderer, which previews the logo via a data URL.
+function hydrateLogo(settingsObj) {
+  const file = settingsObj && settingsObj.school_logo_asset;
+  if (!file || settingsObj.school_logo_dataurl) return settingsObj;
+  try {
+    const ext = path.extname(file).slice(1).toLowerCase();
+    const mime = LOGO_MIME_TYPES[ext] || `image/${ext}`;
+    const dataUrl = `data:${mime};base64,${fs.readFileSync(file).toString('base64')}`;
+    return { ...settingsObj, school_logo_dataurl: dataUrl };
+  } catch (e) {
+    console.warn('[main] could not read logo asset:', e);
+    return settingsObj;
+  }
+}
+
 ipcMain.handle('select-file', async (event, options = {}) => {
   console.log('[main] ipc: select-file', options);
   
@@ -385,7 +429,7 @@ ipcMain.handle('select-file', async (event, options = {}) => {
 
 ipcMain.handle('list-students', async (_evt, { inputPath, settingsObj }) => {
   return new Promise((resolve, reject) => {
-    const settingsFile = writeTempJson(settingsObj, 'settings');
+    const settingsFile = writeTempJson(externalizeLogo(settingsObj), 'settings');
 
     const done = (ok, payloadOrErr) => {
       safeUnlink(settingsFile);
@@ -408,14 +452,14 @@ ipcMain.handle('list-students', async (_evt, { inputPath, settingsObj }) => {
 ipcMain.handle('load-settings', async () => {
   try {
     const p = settingsPath();
-    if (fs.existsSync(p)) return { ok: true, data: JSON.parse(fs.readFileSync(p, 'utf-8')) };
+    if (fs.existsSync(p)) return { ok: true, data: hydrateLogo(JSON.parse(fs.readFileSync(p, 'utf-8'))) };
     return { ok: true, data: {} };
   } catch (e) { return { ok: false, error: String(e) }; }
 });
 
 ipcMain.handle('save-settings', async (_evt, obj) => {
   try {
-    fs.writeFileSync(settingsPath(), JSON.stringify(obj, null, 2), 'utf-8');
+    fs.writeFileSync(settingsPath(), JSON.stringify(externalizeLogo(obj), null, 2), 'utf-8');
     return { ok: true };
   } catch (e) { return { ok: false, error: String(e) }; }
 });
@@ -429,9 +473,9 @@ ipcMain.handle('generate-selected', async (_evt, { inputPath, selectionObj, sett
 
   return new Promise((resolve, reject) => {
     let progress = 0;
-    const settingsFile = writeTempJson(settingsObj, 'settings');
+    const settingsFile = writeTempJson(externalizeLogo(settingsObj), 'settings');
     runBackend(
-     ['--settings', settingsFile, 'generate-selected', '--input', inputPath, '--selection', tmpPath, '--output-dir', app.getPath('userData'), '--attendance', attendancePath || '' ],
+     ['--settings', settingsFile, '--metrics', 'generate-selected', '--input', inputPath, '--selection', tmpPath, '--attendance', attendancePath || '' ],
       (msg) => {
         console.log('[main] cli msg:', msg);
         if (msg.type === 'progress') {
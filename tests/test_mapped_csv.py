@@ -0,0 +1,108 @@
+"""The mapped reader must agree with the csv module on every scoresheet it accepts."""
+import csv
+import io
+import random
+
+import pytest
+
+from backend.mapped_csv import BareCrLineEndings, MappedCsv, decode_cell, read_students
+from backend.scoresheet import open_file, parse_students
+from backend.settings import Settings
+from backend.student import Student
+
+SUBJECT, MESSAGE = "Biology", "Missing work can still be turned in."
+
+
+def _write(tmp_path, data: bytes) -> str:
+    path = tmp_path / "scoresheet.csv"
+    path.write_bytes(data)
+    return str(path)
+
+
+def _csv_rows(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [row for row in csv.reader(f) if row]
+
+
+def _mapped_rows(path):
+    with MappedCsv(path) as f:
+        return [[decode_cell(cell) for cell in row] for row in f.rows()]
+
+
+def _key(student):
+    return (student.name, student.display_name, student.grade, student.percent, tuple(student.missing_assignments))
+
+
+def _outcome(fn):
+    try:
+        return fn()
+    except Exception as e:
+        return type(e)
+
+
+def _baseline(path):
+    return [_key(Student(entry, SUBJECT, MESSAGE)) for entry in open_file(path)]
+
+
+@pytest.mark.parametrize("data", [
+    b'Name,Grade,HW1\n"Doe, Jane",A 95%,0\n',
+    b'Name,Grade,HW1\r\n"Doe, Jane",A 95%,0\r\nRoe,B 80%,5\r\n',
+    b'Name,Grade,Note\nDoe,"see ""late policy"", resubmitted",x\n',
+    b'Name,Grade,Note\nDoe,A 95%,"two\r\nlines"\nRoe,B 80%,"one\nmore"\n',
+    b'\xef\xbb\xbfName,Grade\nDoe,A 95%\n\n\nRoe,B 80%',
+    b'Name,Grade,HW1\nDoe,A 95%,\n,,\nRoe,"B 80%"\n',
+    b'Name,Grade,HW1\nDo"e,A 95%,0\n',
+], ids=["quoted-comma", "crlf", "doubled-quotes", "quoted-newlines", "bom-blank-lines", "empty-cells",
+        "literal-quote"])
+def test_rows_match_csv_module(tmp_path, data):
+    path = _write(tmp_path, data)
+    assert _mapped_rows(path) == _csv_rows(path)
+
+
+@pytest.mark.parametrize("data", [
+    b'Name,Grade,HW1,HW2\r\n"Doe, Jane",A 95%,0,0.0\r\n"Roe, Rick",B 80%,5,"0"\r\n',
+    # A repeated header takes its last column that the row reaches
+    b'Name,Grade,HW1,HW2,HW1\nDoe,A 95%,0,5,5\nRoe,B 80%,5,0,0\nAli,C 70%,0,5\n',
+    # Short rows only carry the headers whose first column they reach
+    b'Name,Grade,HW1,HW2,HW3\nDoe,A 95%,0\nRoe,B 80%\nAli,C 70%,0,0,0,0\n',
+    b'Name,Grade,HW2,HW1,HW2\nDoe,A 95%,0,0\nRoe,B 80%,0,0,0\n',
+], ids=["crlf-quoted", "repeated-header", "short-rows", "repeated-header-out-of-order"])
+def test_read_students_matches_open_file(tmp_path, data):
+    path = _write(tmp_path, data)
+    assert [_key(s) for s in read_students(path, SUBJECT, MESSAGE)] == _baseline(path)
+
+
+def test_header_only_scoresheet_has_no_students(tmp_path):
+    settings = Settings(class_name=SUBJECT, custom_message=MESSAGE)
+    assert read_students(_write(tmp_path, b"Name,Grade,HW1\n"), SUBJECT, MESSAGE) == []
+    assert parse_students(_write(tmp_path, b"Name,Grade,HW1\r"), settings) == []
+
+
+def test_bare_cr_falls_back_to_csv_module(tmp_path):
+    path = _write(tmp_path, b'Name,Grade,HW1\r"Doe, Jane",A 95%,0\rRoe,B 80%,5\r')
+    with pytest.raises(BareCrLineEndings):
+        read_students(path, SUBJECT, MESSAGE)
+    settings = Settings(class_name=SUBJECT, custom_message=MESSAGE)
+    assert [_key(s) for s in parse_students(path, settings)] == _baseline(path)
+
+
+def test_random_scoresheets_match_open_file(tmp_path):
+    rng = random.Random(0)
+    settings = Settings(class_name=SUBJECT, custom_message=MESSAGE)
+    pool = ["Q1", "Q2", "H", "Q1", "Grade"]
+    for _ in range(300):
+        headers = ["Name", "Grade"] + [rng.choice(pool) for _ in range(rng.randint(0, 5))]
+        rows = []
+        for _ in range(rng.randint(1, 4)):
+            width = rng.randint(2, len(headers) + 2)
+            rows.append([rng.choice(["Doe, Jane", "Roe", 'Ali "Al"']), rng.choice(["A 95%", "B 80%"])]
+                        + [rng.choice(["0", "0.0", "5", "", "x,y"]) for _ in range(width - 2)])
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator=rng.choice(["\n", "\r\n", "\r"]),
+                            quoting=rng.choice([csv.QUOTE_MINIMAL, csv.QUOTE_ALL]))
+        writer.writerow(headers)
+        writer.writerows(rows)
+        path = _write(tmp_path, buf.getvalue().encode("utf-8"))
+        # Rows the old reader rejected (e.g. an empty name cell) must fail the same way
+        assert (_outcome(lambda: [_key(s) for s in parse_students(path, settings)])
+                == _outcome(lambda: _baseline(path))), buf.getvalue()
@@ -0,0 +1,95 @@
+"""Arabic shaping, bidi reordering and wrapping in the PDF writer, plus a PyPDF2 round trip."""
+import io
+import unicodedata
+
+import pytest
+from PyPDF2 import PdfReader
+
+from backend.pdf_report import (LRE, PDF_MARK, PdfLetterRenderer, find_unicode_font, paragraph_direction,
+                                shape_arabic, visual_runs)
+from backend.settings import Settings
+
+MARHABA, SHUKRAN = "مرحبا", "شكرا"
+
+
+def _settings(**overrides):
+    values = dict(teacher_name="Teacher Test", teacher_email="teacher@example.org", class_name="Biology",
+                  custom_message="Missing work can still be turned in.", school_name="Synthetic High School",
+                  school_address="12 Main St")
+    return Settings(**{**values, **overrides})
+
+
+def _balanced(line: str) -> bool:
+    depth = 0
+    for ch in line:
+        depth += {LRE: 1, PDF_MARK: -1}.get(ch, 0)
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+def test_shape_arabic_contextual_forms():
+    assert shape_arabic("Jane Doe") == "Jane Doe"
+    # initial seen, final lam-alef ligature, isolated meem
+    assert shape_arabic("سلام") == "ﺳﻼﻡ"
+    assert shape_arabic("لا") == "ﻻ"
+    shaped = shape_arabic(f"{MARHABA} {LRE}Jane{PDF_MARK}")
+    assert shaped.count(LRE) == shaped.count(PDF_MARK) == 1
+    assert unicodedata.normalize("NFKC", shaped) == f"{MARHABA} {LRE}Jane{PDF_MARK}"
+
+
+def test_paragraph_direction_skips_forced_spans():
+    assert paragraph_direction(f"{LRE}Jane Doe{PDF_MARK} {MARHABA}") == "R"
+    assert paragraph_direction(f"Jane {MARHABA}") == "L"
+    assert paragraph_direction("") == "L"
+
+
+def test_visual_runs_keep_forced_spans_left_to_right():
+    assert visual_runs("Jane Doe", "L") == ["Jane Doe"]
+    line = shape_arabic(f"{MARHABA} {LRE}Jane Doe{PDF_MARK} {SHUKRAN}")
+    runs = visual_runs(line, paragraph_direction(line))
+    assert runs == [shape_arabic(SHUKRAN)[::-1] + " ", "Jane Doe", " " + shape_arabic(MARHABA)[::-1]]
+    assert not any(mark in "".join(runs) for mark in (LRE, PDF_MARK))
+
+
+def test_wrap_reopens_forced_spans_across_lines():
+    renderer = PdfLetterRenderer(_settings(), io.BytesIO(), font_path=find_unicode_font())
+    text = shape_arabic(f"{MARHABA} {LRE}Jane Alexandra Doe-Smith of Room 12{PDF_MARK} {SHUKRAN} "
+                        f"{LRE}B ({LRE}85%{PDF_MARK}){PDF_MARK}")
+    lines = renderer._wrap(text, 60)
+    assert len(lines) > 3
+    assert all(_balanced(line) for line in lines)
+    strip = str.maketrans("", "", LRE + PDF_MARK)
+    assert " ".join(line.translate(strip) for line in lines).split() == text.translate(strip).split()
+
+
+def _render(settings, letters):
+    out = io.BytesIO()
+    renderer = PdfLetterRenderer(settings, out)
+    for letter in letters:
+        renderer.add_letter(letter)
+    size = renderer.close()
+    assert size == len(out.getvalue())
+    return PdfReader(io.BytesIO(out.getvalue()))
+
+
+def test_pdf_round_trip():
+    letters = ["To the Parent/Guardian of Doe, Jane,\n" + "\tThis letter is to let you know.\n" * 80,
+               "To the Parent/Guardian of Roe, Rick,\n\tDate: ____"]
+    reader = _render(_settings(), letters)
+    texts = [page.extract_text() for page in reader.pages]
+    # The first letter flows onto a second page; every page repeats the header
+    assert len(texts) == 3
+    for text in texts:
+        assert text.startswith("Synthetic High School\n12 Main St\nteacher@example.org")
+    assert "Doe, Jane" in texts[0] and "Roe, Rick" in texts[2]
+
+
+@pytest.mark.skipif(find_unicode_font() is None, reason="no TrueType font with Arabic glyphs installed")
+def test_pdf_round_trip_arabic():
+    reader = _render(_settings(school_name=f"مدرسة {MARHABA}"), [f"{MARHABA} {LRE}Jane Doe{PDF_MARK} {SHUKRAN}"])
+    text = reader.pages[0].extract_text()
+    # The header is shaped like the letter body, not drawn as isolated letters
+    header, _, body = text.partition("\n12 Main St\n")
+    assert shape_arabic("مدرسة") in header and shape_arabic(MARHABA) in header
+    assert shape_arabic(MARHABA) in body and shape_arabic(SHUKRAN) in body and "Jane Doe" in body